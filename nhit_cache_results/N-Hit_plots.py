@@ -1,29 +1,40 @@
+import heapq
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from collections import defaultdict
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
-from sortedcontainers import SortedList
 import matplotlib.pyplot as plt
 
 def get_file_name():
     return input("Enter the filename (without extension): ")
 
 class NHitCache:
+    __slots__ = ('capacity', 'trigger_threshold', 'insertion_threshold',
+                 '_trigger_count', 'cache', 'tracking', 'heap', 'insertion_counter')
+
     def __init__(self, capacity, trigger_threshold=80.0, insertion_threshold=2):
         self.capacity = capacity
         self.trigger_threshold = trigger_threshold
         self.insertion_threshold = insertion_threshold
+        # len(cache) <= int(x) is equivalent to 100*len/capacity <= threshold
+        # for integer lengths, and costs one integer compare per access.
+        self._trigger_count = int(trigger_threshold * capacity / 100.0)
         self.cache = {}
         self.tracking = defaultdict(int)
-        self.sorted_items = SortedList()
+        self.heap = []
         self.insertion_counter = 0
 
     def _evict(self):
-        if len(self.sorted_items) == 0:
-            return
-        victim_nhit, victim_insertion_counter, victim_item = self.sorted_items.pop(0)
-        del self.cache[victim_item]
+        # Lazy deletion: entries whose item was already evicted or re-promoted
+        # with a higher nhit are stale and simply skipped.
+        while self.heap:
+            victim_nhit, victim_insertion_counter, victim_item = heapq.heappop(self.heap)
+            if self.cache.get(victim_item) == victim_nhit:
+                del self.cache[victim_item]
+                return
 
     def access(self, item):
         self.tracking[item] += 1
@@ -34,13 +45,11 @@ class NHitCache:
         nhit = self.tracking[item]
         self.cache[item] = nhit
         self.insertion_counter += 1
-        self.sorted_items.add((nhit, self.insertion_counter, item))
+        heapq.heappush(self.heap, (nhit, self.insertion_counter, item))
 
     def should_promote(self, item):
-        occupancy_percent = 100.0 * len(self.cache) / self.capacity
-        if occupancy_percent <= self.trigger_threshold:
-            return True
-        return self.tracking[item] >= self.insertion_threshold
+        return (len(self.cache) <= self._trigger_count
+                or self.tracking[item] >= self.insertion_threshold)
 
 def collect_statistics(reads, read_misses, writes, write_misses, cold_misses):
     total_requests = reads + writes
@@ -68,8 +77,15 @@ def collect_statistics(reads, read_misses, writes, write_misses, cold_misses):
         'Write Hit Ratio': write_hit_ratio,
     }
 
-def simulate_nhit(file_path, cache_size=10000, trigger_threshold=80.0, insertion_threshold=2):
-    nhit_cache = NHitCache(cache_size, trigger_threshold, insertion_threshold)
+def load_trace(file_path):
+    """
+    Loads the offset and operation columns of a trace, caching them to an
+    .npz sidecar so the 20-run threshold sweep parses the CSV only once.
+    """
+    cache_path = file_path.with_suffix('.npz')
+    if cache_path.exists():
+        cached = np.load(cache_path, allow_pickle=True)
+        return cached['offsets'], cached['operations']
 
     try:
         data_frame = pd.read_csv(file_path)
@@ -81,33 +97,61 @@ def simulate_nhit(file_path, cache_size=10000, trigger_threshold=80.0, insertion
         print(f"Error: {file_path} does not have at least 5 columns.")
         return None
 
+    offsets = data_frame.iloc[:, 2].to_numpy()
+    operations = data_frame.iloc[:, 4].to_numpy().astype(str)
+    np.savez(cache_path, offsets=offsets, operations=operations)
+    return offsets, operations
+
+def simulate_nhit(offsets, operations, cache_size=10000, trigger_threshold=80.0, insertion_threshold=2):
+    nhit_cache = NHitCache(cache_size, trigger_threshold, insertion_threshold)
+
     read_hits, read_misses = 0, 0
     write_hits, write_misses = 0, 0
-    cold_misses = 0
-    tracked_access = set()
 
-    offsets = data_frame.iloc[:, 2].to_numpy()
-    operations = data_frame.iloc[:, 4].to_numpy()
-
-    for offset, operation in zip(offsets, operations):
-        if offset in nhit_cache.cache:
-            if operation == "Read":
-                read_hits += 1
-            else:
-                write_hits += 1
+    # The first access of every offset is necessarily a miss, so cold misses
+    # equal the number of distinct offsets — one vectorized pass instead of a
+    # per-row set membership test and insertion.
+    cold_misses = int(np.unique(offsets).size)
+    is_read = (operations == "Read")
+
+    # Cache state only changes on misses, so chunks whose every offset is
+    # currently cached can be tallied vectorially. The key mirror used by
+    # np.isin is rebuilt lazily, only after a chunk that contained a miss.
+    n = len(offsets)
+    chunk_size = 4096
+    cache_keys = np.empty(0, dtype=offsets.dtype)
+    cache_dirty = True
+
+    start = 0
+    while start < n:
+        end = min(start + chunk_size, n)
+        if cache_dirty:
+            cache_keys = np.fromiter(nhit_cache.cache, dtype=offsets.dtype,
+                                     count=len(nhit_cache.cache))
+            cache_dirty = False
+        hit_mask = np.isin(offsets[start:end], cache_keys)
+        if hit_mask.all():
+            block_reads = int(np.count_nonzero(is_read[start:end]))
+            read_hits += block_reads
+            write_hits += (end - start) - block_reads
         else:
-            if operation == "Read":
-                read_misses += 1
-            else:
-                write_misses += 1
-            
-            if offset not in tracked_access:
-                cold_misses += 1
-                tracked_access.add(offset)
-            
-            nhit_cache.access(offset)
-            if nhit_cache.should_promote(offset):
-                nhit_cache.promote(offset)
+            for i in range(start, end):
+                offset = offsets[i]
+                if offset in nhit_cache.cache:
+                    if is_read[i]:
+                        read_hits += 1
+                    else:
+                        write_hits += 1
+                else:
+                    if is_read[i]:
+                        read_misses += 1
+                    else:
+                        write_misses += 1
+                    nhit_cache.access(offset)
+                    if nhit_cache.should_promote(offset):
+                        nhit_cache.promote(offset)
+            cache_dirty = True
+        start = end
 
     stats = collect_statistics(
         read_hits + read_misses,
@@ -118,13 +162,25 @@ def simulate_nhit(file_path, cache_size=10000, trigger_threshold=80.0, insertion
     )
     return stats
 
+def _sweep_worker(args):
+    """
+    Runs one (insertion_threshold, trigger_threshold) combination in a worker
+    process, reloading the trace from its .npz sidecar.
+    """
+    file_path, cache_size, ins_thresh, trig_thresh = args
+    trace = load_trace(file_path)
+    if trace is None:
+        return ins_thresh, trig_thresh, 0
+    offsets, operations = trace
+    stats = simulate_nhit(offsets, operations, cache_size, trig_thresh, ins_thresh)
+    return ins_thresh, trig_thresh, stats['Hit Percentage'] if stats else 0
+
 def main():
     file_name = get_file_name()
     cache_size = 10000
     trigger_thresholds = [50, 60, 70, 80, 90]
     insertion_thresholds = [1, 2, 3, 4]
     
-    results = {ins_thresh: [] for ins_thresh in insertion_thresholds}
     base_path = Path(__file__).parent
     file_path = base_path / f"{file_name}.csv"
 
@@ -132,10 +188,20 @@ def main():
         print(f"Error: File {file_path} does not exist.")
         return
 
-    for ins_thresh in tqdm(insertion_thresholds, desc=f"Processing {file_name}", leave=False):
-        for trig_thresh in trigger_thresholds:
-            stats = simulate_nhit(file_path, cache_size, trig_thresh, ins_thresh)
-            results[ins_thresh].append(stats['Hit Percentage'] if stats else 0)
+    # Parse once so every worker finds the .npz sidecar instead of the CSV.
+    if load_trace(file_path) is None:
+        return
+
+    params = [(file_path, cache_size, ins_thresh, trig_thresh)
+              for ins_thresh in insertion_thresholds
+              for trig_thresh in trigger_thresholds]
+    results = {ins_thresh: [0.0] * len(trigger_thresholds) for ins_thresh in insertion_thresholds}
+
+    with ProcessPoolExecutor() as executor:
+        for ins_thresh, trig_thresh, hit_ratio in tqdm(executor.map(_sweep_worker, params),
+                                                       total=len(params),
+                                                       desc=f"Processing {file_name}", leave=False):
+            results[ins_thresh][trigger_thresholds.index(trig_thresh)] = hit_ratio
 
     fig, axes = plt.subplots(figsize=(6, 4))
     for ins_thresh, hit_ratios in results.items():
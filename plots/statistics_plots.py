@@ -1,3 +1,5 @@
+import matplotlib
+matplotlib.use('Agg')  # headless backend; we only save figures
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
@@ -62,96 +64,99 @@ df = pd.DataFrame.from_records(records)
 # Define a color palette
 palette = sns.color_palette("bright", len(df['Policy'].unique()))
 
+# A single figure is reused for all ~20 plots: figure creation dominates the
+# runtime of many small plots, while ax.clear() between saves is cheap.
+fig, ax = plt.subplots(figsize=(10, 6))
+
 # =========================================
 # 1. Individual Line Plots for Each Dataset
 # =========================================
 datasets = df['Dataset'].unique()
 for dataset in datasets:
-    plt.figure(figsize=(10, 6))
+    ax.clear()
     subset = df[df['Dataset'] == dataset]
     sns.lineplot(data=subset, x='Cache Size', y='Hit Ratio (%)',
-                 hue='Policy', marker='o', palette=palette)
-    plt.title(f'Hit Ratio vs Cache Size for Dataset {dataset}', fontsize=14)
-    plt.xlabel('Cache Size', fontsize=12)
-    plt.ylabel('Hit Ratio (%)', fontsize=12)
-    plt.xticks(cache_sizes)
-    plt.legend(title='Policy', fontsize=10, title_fontsize=12)
-    plt.ylim(0, 100)
+                 hue='Policy', marker='o', palette=palette, ax=ax)
+    ax.set_title(f'Hit Ratio vs Cache Size for Dataset {dataset}', fontsize=14)
+    ax.set_xlabel('Cache Size', fontsize=12)
+    ax.set_ylabel('Hit Ratio (%)', fontsize=12)
+    ax.set_xticks(cache_sizes)
+    ax.legend(title='Policy', fontsize=10, title_fontsize=12)
+    ax.set_ylim(0, 100)
 
     # Save plot
-    plt.savefig(os.path.join(output_dir, f"hit_ratio_{dataset}.png"))
-    plt.close()
+    fig.savefig(os.path.join(output_dir, f"hit_ratio_{dataset}.png"))
 
 # =========================================
 # 2. Summary Line Plot Across All Datasets
 # =========================================
-plt.figure(figsize=(12, 8))
+ax.clear()
+fig.set_size_inches(12, 8)
 sns.lineplot(data=df, x='Cache Size', y='Hit Ratio (%)',
-             hue='Policy', style='Dataset', markers=True, dashes=False, palette=palette)
-plt.title('Hit Ratio vs Cache Size Across All Datasets', fontsize=16)
-plt.xlabel('Cache Size', fontsize=14)
-plt.ylabel('Hit Ratio (%)', fontsize=14)
-plt.xticks(cache_sizes)
-plt.legend(title='Policy', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
-plt.ylim(0, 100)
+             hue='Policy', style='Dataset', markers=True, dashes=False, palette=palette, ax=ax)
+ax.set_title('Hit Ratio vs Cache Size Across All Datasets', fontsize=16)
+ax.set_xlabel('Cache Size', fontsize=14)
+ax.set_ylabel('Hit Ratio (%)', fontsize=14)
+ax.set_xticks(cache_sizes)
+ax.legend(title='Policy', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=10)
+ax.set_ylim(0, 100)
 
 # Save plot
-plt.savefig(os.path.join(output_dir, "summary_hit_ratio.png"))
-plt.close()
+fig.savefig(os.path.join(output_dir, "summary_hit_ratio.png"))
+fig.set_size_inches(10, 6)
 
 # =========================================
 # 3. Bar Plots for Each Dataset
 # =========================================
 for dataset in datasets:
+    ax.clear()
     subset = df[df['Dataset'] == dataset]
-    plt.figure(figsize=(10, 6))
-    sns.barplot(data=subset, x='Cache Size', y='Hit Ratio (%)', hue='Policy', palette=palette)
-    plt.title(f'Hit Ratio by Policy and Cache Size for Dataset {dataset}', fontsize=14)
-    plt.xlabel('Cache Size', fontsize=12)
-    plt.ylabel('Hit Ratio (%)', fontsize=12)
-    plt.legend(title='Policy', fontsize=10, title_fontsize=12)
-    plt.ylim(0, 100)
+    sns.barplot(data=subset, x='Cache Size', y='Hit Ratio (%)', hue='Policy', palette=palette, ax=ax)
+    ax.set_title(f'Hit Ratio by Policy and Cache Size for Dataset {dataset}', fontsize=14)
+    ax.set_xlabel('Cache Size', fontsize=12)
+    ax.set_ylabel('Hit Ratio (%)', fontsize=12)
+    ax.legend(title='Policy', fontsize=10, title_fontsize=12)
+    ax.set_ylim(0, 100)
 
     # Save plot
-    plt.savefig(os.path.join(output_dir, f"barplot_{dataset}.png"))
-    plt.close()
+    fig.savefig(os.path.join(output_dir, f"barplot_{dataset}.png"))
 
 # =========================================
 # 4. Per-Policy Line Plots Across Datasets
 # =========================================
 policies = df['Policy'].unique()
 for policy in policies:
-    plt.figure(figsize=(10, 6))
+    ax.clear()
     subset = df[df['Policy'] == policy]
     sns.lineplot(data=subset, x='Cache Size', y='Hit Ratio (%)',
-                 hue='Dataset', marker='o', palette="tab10")
-    plt.title(f'Performance of {policy} Across Datasets', fontsize=14)
-    plt.xlabel('Cache Size', fontsize=12)
-    plt.ylabel('Hit Ratio (%)', fontsize=12)
-    plt.xticks(cache_sizes)
-    plt.legend(title='Dataset', fontsize=10, title_fontsize=12)
-    plt.ylim(0, 100)
+                 hue='Dataset', marker='o', palette="tab10", ax=ax)
+    ax.set_title(f'Performance of {policy} Across Datasets', fontsize=14)
+    ax.set_xlabel('Cache Size', fontsize=12)
+    ax.set_ylabel('Hit Ratio (%)', fontsize=12)
+    ax.set_xticks(cache_sizes)
+    ax.legend(title='Dataset', fontsize=10, title_fontsize=12)
+    ax.set_ylim(0, 100)
 
     # Save plot
-    plt.savefig(os.path.join(output_dir, f"lineplot_{policy}.png"))
-    plt.close()
+    fig.savefig(os.path.join(output_dir, f"lineplot_{policy}.png"))
 
 # =========================================
 # 5. Per-Policy Bar Plots Across Datasets
 # =========================================
 for policy in policies:
-    plt.figure(figsize=(10, 6))
+    ax.clear()
     subset = df[df['Policy'] == policy]
     sns.barplot(data=subset, x='Cache Size', y='Hit Ratio (%)',
-                hue='Dataset', palette="tab10")
-    plt.title(f'Hit Ratio of {policy} by Dataset and Cache Size', fontsize=14)
-    plt.xlabel('Cache Size', fontsize=12)
-    plt.ylabel('Hit Ratio (%)', fontsize=12)
-    plt.legend(title='Dataset', fontsize=10, title_fontsize=12)
-    plt.ylim(0, 100)
+                hue='Dataset', palette="tab10", ax=ax)
+    ax.set_title(f'Hit Ratio of {policy} by Dataset and Cache Size', fontsize=14)
+    ax.set_xlabel('Cache Size', fontsize=12)
+    ax.set_ylabel('Hit Ratio (%)', fontsize=12)
+    ax.legend(title='Dataset', fontsize=10, title_fontsize=12)
+    ax.set_ylim(0, 100)
 
     # Save plot
-    plt.savefig(os.path.join(output_dir, f"barplot_{policy}.png"))
-    plt.close()
+    fig.savefig(os.path.join(output_dir, f"barplot_{policy}.png"))
+
+plt.close(fig)
 
 print(f"All plots have been saved in the '{output_dir}' directory.")
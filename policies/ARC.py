@@ -1,9 +1,248 @@
-import csv
-from collections import OrderedDict
+import numpy as np
+import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
 
+try:
+    from numba import njit
+    from numba.core import types
+    from numba.typed import Dict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _arc_kernel(pages, op_codes, cache_size):
+        """
+        JIT-compiled ARC core over integer page arrays.
+
+        All four ARC lists live in a single slot-based node pool (prev/next/key
+        arrays plus a per-slot list id) with one sentinel slot per list, and a
+        typed dict maps page -> slot. Mirrors ARCCache.process_request.
+
+        :param pages: int64 array of page numbers.
+        :param op_codes: int8 array of operation codes (0=Read, 1=Write).
+        :param cache_size: Maximum number of pages the cache can hold.
+        :return: Tuple (read_requests, read_hits, write_requests, write_hits).
+        """
+        pool = 2 * cache_size + 6
+        prev = np.empty(pool, np.int64)
+        nxt = np.empty(pool, np.int64)
+        key = np.empty(pool, np.int64)
+        lst = np.empty(pool, np.int8)
+        # Sentinels for T1, T2, B1, B2 occupy the last four slots.
+        sent = np.empty(4, np.int64)
+        for l in range(4):
+            s = pool - 4 + l
+            sent[l] = s
+            prev[s] = s
+            nxt[s] = s
+        lens = np.zeros(4, np.int64)
+        free = np.empty(pool - 4, np.int64)
+        for i in range(pool - 4):
+            free[i] = i
+        free_top = pool - 4
+        slot_of = Dict.empty(types.int64, types.int64)
+        p = 0
+
+        read_requests = 0
+        read_hits = 0
+        write_requests = 0
+        write_hits = 0
+
+        for i in range(pages.shape[0]):
+            page = pages[i]
+            op = op_codes[i]
+            if op == 0:
+                read_requests += 1
+            else:
+                write_requests += 1
+
+            hit = False
+            if page in slot_of:
+                s = slot_of[page]
+                l = lst[s]
+                if l == 2:
+                    p = min(cache_size, p + max(1, lens[3] // max(1, lens[2])))
+                elif l == 3:
+                    p = max(0, p - max(1, lens[2] // max(1, lens[3])))
+                else:
+                    hit = True
+                # Move the node to the MRU end of T2 whichever list it was in.
+                pr = prev[s]
+                nx = nxt[s]
+                nxt[pr] = nx
+                prev[nx] = pr
+                lens[l] -= 1
+                t2s = sent[1]
+                tail = prev[t2s]
+                prev[s] = tail
+                nxt[s] = t2s
+                nxt[tail] = s
+                prev[t2s] = s
+                lst[s] = 1
+                lens[1] += 1
+            else:
+                free_top -= 1
+                s = free[free_top]
+                key[s] = page
+                slot_of[page] = s
+                t1s = sent[0]
+                tail = prev[t1s]
+                prev[s] = tail
+                nxt[s] = t1s
+                nxt[tail] = s
+                prev[t1s] = s
+                lst[s] = 0
+                lens[0] += 1
+
+            if hit:
+                if op == 0:
+                    read_hits += 1
+                else:
+                    write_hits += 1
+                continue
+
+            while lens[0] + lens[1] > cache_size:
+                if lens[0] > p:
+                    if lens[0] > 0:
+                        v = nxt[sent[0]]
+                        pr = prev[v]
+                        nx = nxt[v]
+                        nxt[pr] = nx
+                        prev[nx] = pr
+                        lens[0] -= 1
+                        b1s = sent[2]
+                        tail = prev[b1s]
+                        prev[v] = tail
+                        nxt[v] = b1s
+                        nxt[tail] = v
+                        prev[b1s] = v
+                        lst[v] = 2
+                        lens[2] += 1
+                else:
+                    if lens[1] > 0:
+                        v = nxt[sent[1]]
+                        pr = prev[v]
+                        nx = nxt[v]
+                        nxt[pr] = nx
+                        prev[nx] = pr
+                        lens[1] -= 1
+                        b2s = sent[3]
+                        tail = prev[b2s]
+                        prev[v] = tail
+                        nxt[v] = b2s
+                        nxt[tail] = v
+                        prev[b2s] = v
+                        lst[v] = 3
+                        lens[3] += 1
+
+            while lens[0] + lens[1] + lens[2] + lens[3] > 2 * cache_size:
+                if lens[2] > p:
+                    if lens[2] > 0:
+                        v = nxt[sent[2]]
+                        pr = prev[v]
+                        nx = nxt[v]
+                        nxt[pr] = nx
+                        prev[nx] = pr
+                        lens[2] -= 1
+                        del slot_of[key[v]]
+                        free[free_top] = v
+                        free_top += 1
+                else:
+                    if lens[3] > 0:
+                        v = nxt[sent[3]]
+                        pr = prev[v]
+                        nx = nxt[v]
+                        nxt[pr] = nx
+                        prev[nx] = pr
+                        lens[3] -= 1
+                        del slot_of[key[v]]
+                        free[free_top] = v
+                        free_top += 1
+
+        return read_requests, read_hits, write_requests, write_hits
+
+    # Warm up at import so the first real trace doesn't pay the (cached)
+    # compile cost inside its timing.
+    _arc_kernel(np.zeros(4, np.int64), np.zeros(4, np.int8), 4)
+
+
+class LinkedMap:
+    """
+    Minimal insertion-ordered map: a dict of key -> [prev, next, key] nodes on
+    a circular doubly-linked list with a sentinel. Replaces OrderedDict for
+    the hot move/pop operations on the T1/T2/B1/B2 lists.
+    """
+    __slots__ = ('map', 'sentinel')
+
+    def __init__(self):
+        self.map = {}
+        sentinel = [None, None, None]
+        sentinel[0] = sentinel
+        sentinel[1] = sentinel
+        self.sentinel = sentinel
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __len__(self):
+        return len(self.map)
+
+    def _unlink(self, node):
+        node[0][1] = node[1]
+        node[1][0] = node[0]
+
+    def _push_back(self, node):
+        tail = self.sentinel[0]
+        node[0] = tail
+        node[1] = self.sentinel
+        tail[1] = node
+        self.sentinel[0] = node
+
+    def push_mru(self, key):
+        """
+        Inserts a new key at the most-recently-used end.
+
+        :param key: Key to insert.
+        """
+        node = [None, None, key]
+        self.map[key] = node
+        self._push_back(node)
+
+    def move_to_mru(self, key):
+        """
+        Moves an existing key to the most-recently-used end.
+
+        :param key: Key to refresh.
+        """
+        node = self.map[key]
+        self._unlink(node)
+        self._push_back(node)
+
+    def pop(self, key):
+        """
+        Removes a specific key from the map.
+
+        :param key: Key to remove.
+        """
+        node = self.map.pop(key)
+        self._unlink(node)
+
+    def pop_lru(self):
+        """
+        Removes and returns the least-recently-used key.
+
+        :return: The evicted key.
+        """
+        node = self.sentinel[1]
+        self._unlink(node)
+        del self.map[node[2]]
+        return node[2]
+
 
 class ARCCache:
     """
@@ -17,10 +256,10 @@ class ARCCache:
         :param cache_size: Maximum number of pages the cache can hold.
         """
         self.cache_size = cache_size
-        self.T1 = OrderedDict()
-        self.T2 = OrderedDict()
-        self.B1 = OrderedDict()
-        self.B2 = OrderedDict()
+        self.T1 = LinkedMap()
+        self.T2 = LinkedMap()
+        self.B1 = LinkedMap()
+        self.B2 = LinkedMap()
         self.p = 0
 
     def process_request(self, page):
@@ -33,38 +272,36 @@ class ARCCache:
         if page in self.T1 or page in self.T2:
             if page in self.T1:
                 self.T1.pop(page)
-                self.T2[page] = True
+                self.T2.push_mru(page)
             else:
-                self.T2.move_to_end(page)
+                self.T2.move_to_mru(page)
             return True
         elif page in self.B1:
             self.p = min(self.cache_size, self.p + max(1, len(self.B2) // max(1, len(self.B1))))
             self.B1.pop(page)
-            self.T2[page] = True
+            self.T2.push_mru(page)
         elif page in self.B2:
             self.p = max(0, self.p - max(1, len(self.B1) // max(1, len(self.B2))))
             self.B2.pop(page)
-            self.T2[page] = True
+            self.T2.push_mru(page)
         else:
-            self.T1[page] = True
+            self.T1.push_mru(page)
 
         while len(self.T1) + len(self.T2) > self.cache_size:
             if len(self.T1) > self.p:
                 if self.T1:
-                    old, _ = self.T1.popitem(last=False)
-                    self.B1[old] = True
+                    self.B1.push_mru(self.T1.pop_lru())
             else:
                 if self.T2:
-                    old, _ = self.T2.popitem(last=False)
-                    self.B2[old] = True
+                    self.B2.push_mru(self.T2.pop_lru())
 
         while len(self.T1) + len(self.T2) + len(self.B1) + len(self.B2) > 2 * self.cache_size:
             if len(self.B1) > self.p:
                 if self.B1:
-                    self.B1.popitem(last=False)
+                    self.B1.pop_lru()
             else:
                 if self.B2:
-                    self.B2.popitem(last=False)
+                    self.B2.pop_lru()
 
         return False
 
@@ -72,7 +309,7 @@ class ARCCache:
         """
         Simulates the ARC policy on the given dataset.
 
-        :param dataset: List of tuples (page, operation type).
+        :param dataset: Tuple of parallel arrays (pages, int8 op codes).
         :param filename: Name of the file being processed.
         :return: A dictionary containing statistics (hits and misses).
         """
@@ -80,19 +317,28 @@ class ARCCache:
         read_hits, write_hits = 0, 0
         read_misses, write_misses = 0, 0
 
-        for page, operation in tqdm(dataset, desc=f"Processing {filename}", leave=True):
-            if operation == "Read":
-                read_requests += 1
-                if self.process_request(page):
-                    read_hits += 1
-                else:
-                    read_misses += 1
-            elif operation == "Write":
-                write_requests += 1
-                if self.process_request(page):
-                    write_hits += 1
+        pages, op_codes = dataset
+        if NUMBA_AVAILABLE:
+            read_requests, read_hits, write_requests, write_hits = _arc_kernel(
+                pages, op_codes, self.cache_size)
+            read_misses = read_requests - read_hits
+            write_misses = write_requests - write_hits
+        else:
+            for i, page in enumerate(tqdm(pages, total=len(pages),
+                                          desc=f"Processing {filename}", leave=True,
+                                          miniters=10000, mininterval=0.5)):
+                if op_codes[i] == 0:
+                    read_requests += 1
+                    if self.process_request(page):
+                        read_hits += 1
+                    else:
+                        read_misses += 1
                 else:
-                    write_misses += 1
+                    write_requests += 1
+                    if self.process_request(page):
+                        write_hits += 1
+                    else:
+                        write_misses += 1
 
         return {
             "Read Requests": read_requests,
@@ -117,25 +363,23 @@ def load_sequence(file_path, start_time=0, end_time=float('inf')):
     :param file_path: Path to the CSV file.
     :param start_time: Start time for filtering requests.
     :param end_time: End time for filtering requests.
-    :return: List of tuples (page number, operation type).
+    :return: Tuple of parallel arrays (page numbers, int8 op codes: 0=read, 1=write).
     """
-    sequence = []
     try:
-        with file_path.open('r') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                try:
-                    timestamp = float(row[0])
-                    if start_time <= timestamp <= end_time:
-                        page = int(float(row[2])) // 4096
-                        operation = row[4].strip()
-                        if operation in {"Read", "Write"}:
-                            sequence.append((page, operation))
-                except (ValueError, IndexError):
-                    continue
+        data_frame = pd.read_csv(file_path, header=None, usecols=[0, 2, 4],
+                                 engine='c', on_bad_lines='skip')
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
-    return sequence
+        return np.empty(0, np.int64), np.empty(0, np.int8)
+
+    timestamps = pd.to_numeric(data_frame[0], errors='coerce')
+    offsets = pd.to_numeric(data_frame[2], errors='coerce')
+    operations = data_frame[4].astype(str).str.strip()
+    mask = ((timestamps >= start_time) & (timestamps <= end_time)
+            & offsets.notna() & operations.isin(("Read", "Write")))
+    pages = offsets[mask].to_numpy(np.int64) // 4096
+    op_codes = (operations[mask] == "Write").to_numpy().astype(np.int8)
+    return pages, op_codes
 
 
 def display_results(stats, filename):
@@ -175,7 +419,7 @@ def run_simulation(file_name, cache_size, start_time=0, end_time=float('inf')):
     file_path = script_dir / file_name
 
     sequence = load_sequence(file_path, start_time, end_time)
-    if not sequence:
+    if sequence[0].size == 0:
         print(f"Error: No valid page references found in {file_name}.")
         return
 
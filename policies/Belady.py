@@ -1,11 +1,118 @@
-import csv
-import heapq
+import numpy as np
+import trace_loader
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
+from sortedcontainers import SortedList
+
+try:
+    from numba import njit
+    from numba.core import types
+    from numba.typed import Dict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 INFINITY = float('inf')
 
+# Up to this capacity the resident set fits comfortably in L2, where a numpy
+# argmax scan per eviction beats per-access SortedList maintenance.
+ARGMAX_CAPACITY_LIMIT = 65536
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _belady_kernel(pages, op_codes, next_use, capacity):
+        """
+        JIT-compiled core of Belady's optimal replacement.
+
+        Resident pages live in a typed dict mapping page -> stored next use,
+        and eviction candidates sit in a hand-rolled binary max-heap of
+        (next_use, page) pairs with lazy deletion: a popped entry is discarded
+        unless its next_use still matches the dict, so stale entries left
+        behind by hits never influence an eviction.
+
+        :param pages: int64 array of requested page offsets.
+        :param op_codes: int8 array of operation codes (0=read, 1=write).
+        :param next_use: int64 array of precomputed next-use indices.
+        :param capacity: Maximum number of items the cache can hold.
+        :return: Tuple (read_hits, read_misses, write_hits, write_misses).
+        """
+        n = pages.shape[0]
+        page_next_use = Dict.empty(types.int64, types.int64)
+        # Every request pushes at most one heap entry.
+        heap_nu = np.empty(n + 1, dtype=np.int64)
+        heap_pg = np.empty(n + 1, dtype=np.int64)
+        heap_len = 0
+
+        read_hits = 0
+        read_misses = 0
+        write_hits = 0
+        write_misses = 0
+
+        for i in range(n):
+            page = pages[i]
+            nu = next_use[i]
+            stored = page_next_use.get(page, np.int64(-1))
+            hit = stored != np.int64(-1)
+
+            if hit:
+                if op_codes[i] == 0:
+                    read_hits += 1
+                else:
+                    write_hits += 1
+            else:
+                if op_codes[i] == 0:
+                    read_misses += 1
+                else:
+                    write_misses += 1
+                if len(page_next_use) >= capacity:
+                    # Pop until the root is a live entry.
+                    while True:
+                        victim_nu = heap_nu[0]
+                        victim_pg = heap_pg[0]
+                        heap_len -= 1
+                        last_nu = heap_nu[heap_len]
+                        last_pg = heap_pg[heap_len]
+                        pos = 0
+                        while True:
+                            child = 2 * pos + 1
+                            if child >= heap_len:
+                                break
+                            if child + 1 < heap_len and heap_nu[child + 1] > heap_nu[child]:
+                                child += 1
+                            if heap_nu[child] <= last_nu:
+                                break
+                            heap_nu[pos] = heap_nu[child]
+                            heap_pg[pos] = heap_pg[child]
+                            pos = child
+                        heap_nu[pos] = last_nu
+                        heap_pg[pos] = last_pg
+                        if page_next_use.get(victim_pg, np.int64(-1)) == victim_nu:
+                            del page_next_use[victim_pg]
+                            break
+
+            # Record (or refresh, on a hit) the page's next use; the previous
+            # heap entry for a hit page goes stale and is skipped lazily.
+            page_next_use[page] = nu
+            pos = heap_len
+            heap_len += 1
+            while pos > 0:
+                parent = (pos - 1) // 2
+                if heap_nu[parent] >= nu:
+                    break
+                heap_nu[pos] = heap_nu[parent]
+                heap_pg[pos] = heap_pg[parent]
+                pos = parent
+            heap_nu[pos] = nu
+            heap_pg[pos] = page
+
+        return read_hits, read_misses, write_hits, write_misses
+
+    # Warm up the JIT compile (cached on disk after the first run).
+    _belady_kernel(np.zeros(4, np.int64), np.zeros(4, np.int8),
+                   np.full(4, np.iinfo(np.int64).max, np.int64), 4)
+
 class OptimalCache:
     """
     Optimal Cache Replacement Policy (Belady's Algorithm).
@@ -17,10 +124,17 @@ class OptimalCache:
         :param capacity: Maximum number of items the cache can hold.
         """
         self.capacity = capacity
-        self.cache = set()
-        self.heap = []
-        self.page_next_use = {}
-        self.seen_pages = set()
+        self.use_argmax = capacity <= ARGMAX_CAPACITY_LIMIT
+        if self.use_argmax:
+            # Resident set as parallel arrays: hits update a slot in place
+            # and evictions argmax-scan resident_nu (SIMD'd C, capacity-bound).
+            self.slot_of = {}
+            self.resident_pages = np.empty(capacity, dtype=np.int64)
+            self.resident_nu = np.empty(capacity, dtype=np.int64)
+            self.n_resident = 0
+        else:
+            self.cache = set()
+            self.sorted_next_uses = SortedList()
 
     def is_hit(self, page):
         """
@@ -29,34 +143,51 @@ class OptimalCache:
         :param page: The page offset to check.
         :return: True if hit, False otherwise.
         """
+        if self.use_argmax:
+            return page in self.slot_of
         return page in self.cache
 
-    def access_page(self, page, next_use):
+    def access_page(self, page, next_use, index):
         """
         Accesses a page, updating the cache and its usage information.
 
         :param page: The page offset being accessed.
         :param next_use: The index of the next use of this page.
+        :param index: The index of this request in the trace.
         :return: Tuple (hit: bool, evicted_page: Optional[int])
         """
+        if self.use_argmax:
+            slot = self.slot_of.get(page, -1)
+            if slot != -1:
+                self.resident_nu[slot] = next_use
+                return True, None
+            evicted_page = None
+            if self.n_resident >= self.capacity:
+                slot = int(self.resident_nu.argmax())
+                evicted_page = int(self.resident_pages[slot])
+                del self.slot_of[evicted_page]
+            else:
+                slot = self.n_resident
+                self.n_resident += 1
+            self.resident_pages[slot] = page
+            self.resident_nu[slot] = next_use
+            self.slot_of[page] = slot
+            return False, evicted_page
+
         if page in self.cache:
-            self.page_next_use[page] = next_use
-            heapq.heappush(self.heap, (-next_use, page))
+            # A resident page's stored next_use is the index at which it is
+            # next requested — i.e. exactly this request's index — so the old
+            # entry is known without a per-page lookup.
+            self.sorted_next_uses.remove((index, page))
+            self.sorted_next_uses.add((next_use, page))
             return True, None
         else:
             evicted_page = None
             if len(self.cache) >= self.capacity:
-                while self.heap:
-                    farthest_neg_nu, farthest_page = heapq.heappop(self.heap)
-                    farthest_nu = -farthest_neg_nu
-                    if farthest_page in self.cache and self.page_next_use.get(farthest_page, -1) == farthest_nu:
-                        self.cache.remove(farthest_page)
-                        del self.page_next_use[farthest_page]
-                        evicted_page = farthest_page
-                        break
+                farthest_nu, evicted_page = self.sorted_next_uses.pop()
+                self.cache.remove(evicted_page)
             self.cache.add(page)
-            self.page_next_use[page] = next_use
-            heapq.heappush(self.heap, (-next_use, page))
+            self.sorted_next_uses.add((next_use, page))
             return False, evicted_page
 
     def current_occupancy(self):
@@ -65,6 +196,8 @@ class OptimalCache:
 
         :return: Integer count of items in cache.
         """
+        if self.use_argmax:
+            return self.n_resident
         return len(self.cache)
 
 class CacheSimulator:
@@ -79,86 +212,74 @@ class CacheSimulator:
         """
         self.cache_size = cache_size
 
-    def read_csv(self, filename, start_time=0, end_time=INFINITY):
-        """
-        Reads the relevant columns from a CSV file and filters requests based on start and end time.
-
-        :param filename: Path to the CSV file.
-        :param start_time: Start time for filtering requests.
-        :param end_time: End time for filtering requests.
-        :return: List of tuples containing (page_offset, request_type).
-        """
-        sequence = []
-        with filename.open('r') as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                if len(row) < 5:
-                    continue
-                try:
-                    timestamp = float(row[0])
-                    if timestamp < start_time or timestamp > end_time:
-                        continue
-                    page_offset = int(row[2])
-                    request_type = row[4].strip().lower()
-                    if request_type in {'read', 'write'}:
-                        sequence.append((page_offset, request_type))
-                except (ValueError, IndexError):
-                    continue
-        return sequence
-
-    def precompute_next_use(self, sequence):
+    def precompute_next_use(self, pages):
         """
         Precomputes the next use index for each page in the sequence.
 
-        :param sequence: List of page requests as (page_offset, request_type).
-        :return: List where next_use[i] is the index of the next request for the same page after i, or INFINITY.
-        """
-        N = len(sequence)
-        next_use = [INFINITY] * N
-        last_occurrence = {}
-        for i in range(N - 1, -1, -1):
-            page, _ = sequence[i]
-            if page in last_occurrence:
-                next_use[i] = last_occurrence[page]
-            last_occurrence[page] = i
+        Vectorized: pages are factorized to dense ids, grouped with a stable
+        argsort, and each access's successor within its group is its next use.
+
+        :param pages: int64 array of requested page offsets.
+        :return: int64 numpy array where next_use[i] is the index of the next request
+                 for the same page after i, or int64 max if there is none.
+        """
+        N = pages.shape[0]
+        _, inverse = np.unique(pages, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        next_use = np.full(N, np.iinfo(np.int64).max, dtype=np.int64)
+        same_page = inverse[order[:-1]] == inverse[order[1:]]
+        next_use[order[:-1][same_page]] = order[1:][same_page]
         return next_use
 
-    def simulate(self, sequence, next_use, filename):
+    def simulate(self, pages, op_codes, next_use, filename):
         """
         Simulates Belady's Optimal Cache Replacement Algorithm.
 
-        :param sequence: List of page requests as (page_offset, request_type).
+        :param pages: int64 array of requested page offsets.
+        :param op_codes: int8 array of operation codes (0=read, 1=write).
         :param next_use: Precomputed next use indices for each request.
         :param filename: The name of the file being processed (for progress bar).
         :return: Dictionary containing statistics on hits, misses, and other metrics.
         """
-        cache = OptimalCache(self.cache_size)
-        total_requests = len(sequence)
-        total_hits = 0
-        total_misses = 0
-        read_hits = 0
-        read_misses = 0
-        write_hits = 0
-        write_misses = 0
-
-        for i in tqdm(range(total_requests), desc=f"Processing {filename}"):
-            page, req_type = sequence[i]
-            nu = next_use[i]
+        total_requests = pages.shape[0]
 
-            if cache.is_hit(page):
-                total_hits += 1
-                if req_type == 'read':
-                    read_hits += 1
-                else:
-                    write_hits += 1
-                cache.access_page(page, nu)
-            else:
-                total_misses += 1
-                if req_type == 'read':
-                    read_misses += 1
-                else:
-                    write_misses += 1
-                cache.access_page(page, nu)
+        if NUMBA_AVAILABLE:
+            print(f"Processing {filename} ({total_requests} requests, jitted)")
+            read_hits, read_misses, write_hits, write_misses = _belady_kernel(
+                pages, op_codes, next_use, self.cache_size
+            )
+        else:
+            cache = OptimalCache(self.cache_size)
+            read_hits = 0
+            write_hits = 0
+
+            # The trace is walked in chunks: the scalar loop only maintains
+            # cache state and records hits into a reusable buffer, while the
+            # read/write counter branching is done per chunk with numpy
+            # reductions. (Hit detection itself cannot be vectorized here —
+            # a resident page's next_use must be refreshed on every hit or
+            # later evictions pick the wrong victim.)
+            chunk = 4096
+            hit_buffer = np.empty(chunk, dtype=bool)
+            with tqdm(total=total_requests, desc=f"Processing {filename}",
+                      miniters=10000, mininterval=0.5) as pbar:
+                for start in range(0, total_requests, chunk):
+                    stop = min(start + chunk, total_requests)
+                    for j in range(stop - start):
+                        i = start + j
+                        hit, _ = cache.access_page(pages[i], next_use[i], i)
+                        hit_buffer[j] = hit
+                    chunk_hits = hit_buffer[:stop - start]
+                    chunk_writes = op_codes[start:stop] == 1
+                    write_hits += int((chunk_hits & chunk_writes).sum())
+                    read_hits += int((chunk_hits & ~chunk_writes).sum())
+                    pbar.update(stop - start)
+
+            read_misses = int((op_codes == 0).sum()) - read_hits
+            write_misses = int((op_codes == 1).sum()) - write_hits
+
+        total_hits = read_hits + write_hits
+        total_misses = read_misses + write_misses
 
         hit_percentage = (total_hits / total_requests) * 100 if total_requests > 0 else 0
         read_total = read_hits + read_misses
@@ -224,14 +345,14 @@ def cache_simulator(filename, cache_size=10000, start_time=0, end_time=INFINITY)
         return
 
     simulator = CacheSimulator(cache_size=cache_size)
-    sequence = simulator.read_csv(file_path, start_time, end_time)
+    pages, op_codes = trace_loader.load(file_path, start_time, end_time)
 
-    if not sequence:
+    if pages.size == 0:
         print("Error: No valid data found in the input file.")
         return
 
-    next_use = simulator.precompute_next_use(sequence)
-    stats = simulator.simulate(sequence, next_use, filename)
+    next_use = simulator.precompute_next_use(pages)
+    stats = simulator.simulate(pages, op_codes, next_use, filename)
     simulator.display_results(stats)
 
 def main():
@@ -246,4 +367,5 @@ def main():
     for fname in filenames:
         cache_simulator(fname, cache_size, start_time, end_time)
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,10 +1,114 @@
-import csv
-from collections import OrderedDict
+import numpy as np
+import trace_loader
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
 
 
+class LinkedMap:
+    """
+    Minimal insertion-ordered map: a dict of key -> [prev, next, key] nodes on
+    a circular doubly-linked list with a sentinel. Replaces OrderedDict for
+    the hot move/pop operations on the cache and ghost lists.
+    """
+    __slots__ = ('map', 'sentinel')
+
+    def __init__(self):
+        self.map = {}
+        sentinel = [None, None, None]
+        sentinel[0] = sentinel
+        sentinel[1] = sentinel
+        self.sentinel = sentinel
+
+    def __contains__(self, key):
+        return key in self.map
+
+    def __len__(self):
+        return len(self.map)
+
+    def _unlink(self, node):
+        node[0][1] = node[1]
+        node[1][0] = node[0]
+
+    def _push_back(self, node):
+        tail = self.sentinel[0]
+        node[0] = tail
+        node[1] = self.sentinel
+        tail[1] = node
+        self.sentinel[0] = node
+
+    def push_mru(self, key):
+        """
+        Inserts a new key at the most-recently-used end.
+
+        :param key: Key to insert.
+        """
+        node = [None, None, key]
+        self.map[key] = node
+        self._push_back(node)
+
+    def move_to_mru(self, key):
+        """
+        Moves an existing key to the most-recently-used end.
+
+        :param key: Key to refresh.
+        """
+        node = self.map[key]
+        self._unlink(node)
+        self._push_back(node)
+
+    def touch(self, key):
+        """
+        Moves a key to the most-recently-used end if present.
+
+        Single dict lookup, replacing the separate `in` + move pair.
+
+        :param key: Key to refresh.
+        :return: True if the key was present, False otherwise.
+        """
+        node = self.map.get(key)
+        if node is None:
+            return False
+        self._unlink(node)
+        self._push_back(node)
+        return True
+
+    def discard(self, key):
+        """
+        Removes a key if present.
+
+        Single dict lookup, replacing the separate `in` + pop pair.
+
+        :param key: Key to remove.
+        :return: True if the key was present, False otherwise.
+        """
+        node = self.map.pop(key, None)
+        if node is None:
+            return False
+        self._unlink(node)
+        return True
+
+    def pop(self, key):
+        """
+        Removes a specific key from the map.
+
+        :param key: Key to remove.
+        """
+        node = self.map.pop(key)
+        self._unlink(node)
+
+    def pop_lru(self):
+        """
+        Removes and returns the least-recently-used key.
+
+        :return: The evicted key.
+        """
+        node = self.sentinel[1]
+        self._unlink(node)
+        del self.map[node[2]]
+        return node[2]
+
+
 class LARCCache:
     """
     A simulator for the LARC (Least Adaptive Replacement Cache) policy with detailed metrics reporting.
@@ -17,9 +121,10 @@ class LARCCache:
         :param cache_size: Maximum number of pages the cache can hold.
         """
         self.cache_size = cache_size
-        self.cache = OrderedDict()
-        self.recent_cache = OrderedDict()
+        self.cache = LinkedMap()
+        self.recent_cache = LinkedMap()
         self.recent_cache_limit = 0.1 * cache_size
+        self._limit_int = int(self.recent_cache_limit)
 
     def process_request(self, page):
         """
@@ -28,49 +133,101 @@ class LARCCache:
         :param page: Page number to be processed.
         :return: True if the page is a cache hit, False otherwise.
         """
-        if page in self.cache:
-            self.cache.move_to_end(page)
-            self.recent_cache_limit = max(0.1 * self.cache_size, self.recent_cache_limit - self.cache_size / (self.cache_size - self.recent_cache_limit))
+        if self.cache.touch(page):
+            # The limit never reaches cache_size (it is capped at 0.9x), but
+            # guard the denominator anyway for tiny cache sizes.
+            self.recent_cache_limit = max(0.1 * self.cache_size, self.recent_cache_limit - self.cache_size / max(self.cache_size - self.recent_cache_limit, 1.0))
+            self._limit_int = int(self.recent_cache_limit)
             return True
-        elif page in self.recent_cache:
-            self.recent_cache_limit = min(0.9 * self.cache_size, self.recent_cache_limit + self.cache_size / self.recent_cache_limit)
-            self.recent_cache.pop(page)
-            self.cache[page] = True
+        elif self.recent_cache.discard(page):
+            self.recent_cache_limit = min(0.9 * self.cache_size, self.recent_cache_limit + self.cache_size / max(self.recent_cache_limit, 1.0))
+            self._limit_int = int(self.recent_cache_limit)
+            self.cache.push_mru(page)
             if len(self.cache) > self.cache_size:
-                self.cache.popitem(last=False)
+                self.cache.pop_lru()
             return False
         else:
-            self.recent_cache[page] = True
-            if len(self.recent_cache) > self.recent_cache_limit:
-                self.recent_cache.popitem(last=False)
+            self.recent_cache.push_mru(page)
+            # A single pop is not enough when the adaptive limit has just
+            # dropped by more than one entry; re-trim until within bounds.
+            while len(self.recent_cache) > self._limit_int:
+                self.recent_cache.pop_lru()
             return False
 
     def simulate(self, dataset, filename):
         """
         Simulates the LARC policy on the given dataset.
 
-        :param dataset: List of tuples (page, operation type).
+        :param dataset: Tuple of parallel arrays (pages, int8 op codes).
         :param filename: Name of the file being processed.
         :return: A dictionary containing statistics (hits and misses).
         """
+        pages, op_codes = dataset
+        hits = np.empty(pages.size, dtype=bool)
+        for i, page in enumerate(tqdm(pages, desc=f"Processing {filename}", leave=True,
+                                      miniters=10000, mininterval=0.5)):
+            hits[i] = self.process_request(page)
+
+        # One masked reduction per counter instead of per-request branching.
+        reads = op_codes == 0
+        read_requests = int(reads.sum())
+        write_requests = pages.size - read_requests
+        read_hits = int((reads & hits).sum())
+        write_hits = int(hits.sum()) - read_hits
+        read_misses = read_requests - read_hits
+        write_misses = write_requests - write_hits
+
+        return self._build_stats(read_requests, read_hits, read_misses,
+                                 write_requests, write_hits, write_misses)
+
+    def simulate_streaming(self, file_path, filename, start_time=0,
+                           end_time=float('inf'), chunksize=1_000_000):
+        """
+        Simulates the LARC policy over a trace too large to load whole.
+
+        Chunks arrive through trace_loader.iter_chunks (a bounded-queue
+        prefetch pipeline) and cache state persists across chunks, so the
+        results match simulate while peak memory stays bounded by the chunk
+        size.
+
+        :param file_path: Path to the CSV file.
+        :param filename: Name of the file being processed.
+        :param start_time: Start time for filtering requests.
+        :param end_time: End time for filtering requests.
+        :param chunksize: Number of CSV rows parsed per chunk.
+        :return: A dictionary containing statistics (hits and misses).
+        """
         read_requests, write_requests = 0, 0
         read_hits, write_hits = 0, 0
-        read_misses, write_misses = 0, 0
-
-        for page, operation in tqdm(dataset, desc=f"Processing {filename}", leave=True):
-            if operation == "Read":
-                read_requests += 1
-                if self.process_request(page):
-                    read_hits += 1
-                else:
-                    read_misses += 1
-            elif operation == "Write":
-                write_requests += 1
-                if self.process_request(page):
-                    write_hits += 1
-                else:
-                    write_misses += 1
 
+        for offsets, op_codes in trace_loader.iter_chunks(file_path, start_time,
+                                                          end_time, chunksize):
+            pages = offsets // 4096
+            hits = np.empty(pages.size, dtype=bool)
+            for i, page in enumerate(pages):
+                hits[i] = self.process_request(page)
+
+            reads = op_codes == 0
+            chunk_reads = int(reads.sum())
+            read_requests += chunk_reads
+            write_requests += pages.size - chunk_reads
+            chunk_read_hits = int((reads & hits).sum())
+            read_hits += chunk_read_hits
+            write_hits += int(hits.sum()) - chunk_read_hits
+
+        return self._build_stats(read_requests, read_hits,
+                                 read_requests - read_hits,
+                                 write_requests, write_hits,
+                                 write_requests - write_hits)
+
+    @staticmethod
+    def _build_stats(read_requests, read_hits, read_misses,
+                     write_requests, write_hits, write_misses):
+        """
+        Assembles the statistics dictionary shared by both simulate paths.
+
+        :return: A dictionary containing statistics (hits and misses).
+        """
         return {
             "Read Requests": read_requests,
             "Read Hits": read_hits,
@@ -89,30 +246,20 @@ class LARCCache:
 
 def load_sequence(file_path, start_time=0, end_time=float('inf')):
     """
-    Loads the sequence of page requests from a CSV file.
+    Loads the sequence of page requests from a CSV file via the shared
+    trace loader, applying LARC's 4 KiB page granularity.
 
     :param file_path: Path to the CSV file.
     :param start_time: Start time for filtering requests.
     :param end_time: End time for filtering requests.
-    :return: List of tuples (page number, operation type).
+    :return: Tuple of parallel arrays (page numbers, int8 op codes: 0=read, 1=write).
     """
-    sequence = []
     try:
-        with file_path.open('r') as file:
-            reader = csv.reader(file)
-            for row in reader:
-                try:
-                    timestamp = float(row[0])
-                    if start_time <= timestamp <= end_time:
-                        page = int(float(row[2])) // 4096
-                        operation = row[4].strip()
-                        if operation in {"Read", "Write"}:
-                            sequence.append((page, operation))
-                except (ValueError, IndexError):
-                    continue
+        offsets, op_codes = trace_loader.load(file_path, start_time, end_time)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
-    return sequence
+        return np.empty(0, np.int64), np.empty(0, np.int8)
+    return offsets // 4096, op_codes
 
 
 def display_results(stats, filename):
@@ -139,26 +286,36 @@ def display_results(stats, filename):
     print("----------------------------")
 
 
-def run_simulation(file_name, cache_size, start_time=0, end_time=float('inf')):
+def run_simulation(file_name, cache_sizes, start_time=0, end_time=float('inf')):
     """
-    Runs the LARC simulation for a specific file.
+    Runs the LARC simulation for a specific file across cache sizes.
+
+    The trace is parsed once and the arrays are reused for every size in
+    the sweep, so ingestion cost is paid once instead of per size.
 
     :param file_name: Name of the CSV file.
-    :param cache_size: Maximum number of pages the cache can hold.
+    :param cache_sizes: List of cache sizes to sweep.
     :param start_time: Start time for filtering requests.
     :param end_time: End time for filtering requests.
     """
     script_dir = Path(__file__).parent
     file_path = script_dir / file_name
 
-    sequence = load_sequence(file_path, start_time, end_time)
-    if not sequence:
+    pages, op_codes = load_sequence(file_path, start_time, end_time)
+    if pages.size == 0:
         print(f"Error: No valid page references found in {file_name}.")
         return
 
-    simulator = LARCCache(cache_size)
-    stats = simulator.simulate(sequence, file_path.stem)
-    display_results(stats, file_path.stem)
+    sweep = []
+    for cache_size in cache_sizes:
+        simulator = LARCCache(cache_size)
+        stats = simulator.simulate((pages, op_codes), file_path.stem)
+        display_results(stats, file_path.stem)
+        sweep.append([cache_size, f"{stats['Overall Hit Ratio']:.2f}%"])
+
+    if len(cache_sizes) > 1:
+        print(f"\nCache size sweep for {file_path.stem}:")
+        print(tabulate(sweep, headers=["Cache Size", "Hit Rate"], tablefmt="grid"))
 
 
 def main():
@@ -167,11 +324,13 @@ def main():
     """
     filenames = ["A42.csv", "A108.csv", "A129.csv", "A669.csv"]
 
-    cache_size = int(input("Enter cache size (default: 10000): ") or 10000)
+    sizes_input = input("Enter cache sizes, comma-separated (default: 10000): ") or "10000"
+    cache_sizes = [int(size) for size in sizes_input.split(',')]
     start_time = float(input("Enter start time (default: 0): ") or 0)
     end_time = float(input("Enter end time (default: infinity): ") or float('inf'))
 
     for file_name in filenames:
-        run_simulation(file_name, cache_size, start_time, end_time)
+        run_simulation(file_name, cache_sizes, start_time, end_time)
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
\ No newline at end of file
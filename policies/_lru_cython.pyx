@@ -0,0 +1,127 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Integer-keyed LRU cache as a small C extension.
+
+Optional drop-in replacement for the pure-Python LRUCache used by the
+fallback loop in ``LRU&N-Hit.py`` when numba is not installed. Each call does
+one dict lookup plus pointer swaps on preallocated C arrays instead of
+several Python-level method dispatches. Build in place with:
+
+    python setup_lru_ext.py build_ext --inplace
+"""
+from libc.stdlib cimport malloc, free
+from libc.stdint cimport int64_t
+
+
+cdef class IntLRUCache:
+    """
+    LRU cache over int64 keys, backed by a slot-based circular doubly-linked
+    list (prev/next/key C arrays with a sentinel slot) and a dict mapping
+    key -> slot.
+    """
+
+    cdef readonly Py_ssize_t capacity
+    cdef dict slot_of
+    cdef int64_t* prev
+    cdef int64_t* nxt
+    cdef int64_t* key
+    cdef int64_t sent
+    cdef int64_t next_slot
+
+    def __cinit__(self, Py_ssize_t capacity):
+        self.capacity = capacity
+        self.slot_of = {}
+        self.prev = <int64_t*>malloc((capacity + 1) * sizeof(int64_t))
+        self.nxt = <int64_t*>malloc((capacity + 1) * sizeof(int64_t))
+        self.key = <int64_t*>malloc((capacity + 1) * sizeof(int64_t))
+        if self.prev == NULL or self.nxt == NULL or self.key == NULL:
+            raise MemoryError()
+        self.sent = capacity
+        self.prev[self.sent] = self.sent
+        self.nxt[self.sent] = self.sent
+        self.next_slot = 0
+
+    def __dealloc__(self):
+        free(self.prev)
+        free(self.nxt)
+        free(self.key)
+
+    cdef void _unlink(self, int64_t slot):
+        cdef int64_t p = self.prev[slot]
+        cdef int64_t n = self.nxt[slot]
+        self.nxt[p] = n
+        self.prev[n] = p
+
+    cdef void _push_mru(self, int64_t slot):
+        cdef int64_t tail = self.prev[self.sent]
+        self.prev[slot] = tail
+        self.nxt[slot] = self.sent
+        self.nxt[tail] = slot
+        self.prev[self.sent] = slot
+
+    cpdef bint touch(self, int64_t item):
+        """
+        Accesses a key, refreshing its LRU order if present.
+
+        :param item: Key to access in the cache.
+        :return: True if the key was present, False otherwise.
+        """
+        cdef int64_t slot
+        s = self.slot_of.get(item)
+        if s is None:
+            return False
+        slot = s
+        self._unlink(slot)
+        self._push_mru(slot)
+        return True
+
+    cpdef insert(self, int64_t item):
+        """
+        Inserts a key, evicting the least recently used entry if at capacity.
+
+        :param item: Key to insert into the cache.
+        :return: The evicted key if any, otherwise None.
+        """
+        cdef int64_t slot
+        cdef int64_t evicted
+        s = self.slot_of.get(item)
+        if s is not None:
+            slot = s
+            self._unlink(slot)
+            self._push_mru(slot)
+            return None
+        if self.next_slot < self.capacity:
+            slot = self.next_slot
+            self.next_slot += 1
+            self.slot_of[item] = slot
+            self.key[slot] = item
+            self._push_mru(slot)
+            return None
+        slot = self.nxt[self.sent]
+        evicted = self.key[slot]
+        self._unlink(slot)
+        del self.slot_of[evicted]
+        self.slot_of[item] = slot
+        self.key[slot] = item
+        self._push_mru(slot)
+        return evicted
+
+    cpdef int touch_or_insert(self, int64_t item):
+        """
+        Fused access-or-insert for plain-LRU replay: one call per request.
+
+        :param item: Key to access or insert.
+        :return: 1 if the key was already cached, 0 if it was inserted.
+        """
+        if self.touch(item):
+            return 1
+        self.insert(item)
+        return 0
+
+    cpdef Py_ssize_t occupancy(self):
+        """
+        Returns the current number of items in the cache.
+
+        :return: Integer count of items in the cache.
+        """
+        return len(self.slot_of)
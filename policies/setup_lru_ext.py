@@ -0,0 +1,14 @@
+"""
+Builds the optional Cython LRU extension used by LRU&N-Hit.py.
+
+Usage (from the policies directory):
+
+    python setup_lru_ext.py build_ext --inplace
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="lru-cython-ext",
+    ext_modules=cythonize("_lru_cython.pyx"),
+)
@@ -0,0 +1,219 @@
+import mmap
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+def _filter_columns(timestamps, offsets, operations):
+    """
+    Applies the common validity filter and encodes the parsed columns.
+
+    :param timestamps: Series of timestamps (NaN where unparseable).
+    :param offsets: Series of offsets (NaN where unparseable).
+    :param operations: Series of raw operation strings.
+    :return: Tuple of arrays (timestamps float64, offsets int64, op codes int8).
+    """
+    operations = operations.astype(str).str.strip().str.lower()
+    valid = (timestamps.notna() & offsets.notna()
+             & operations.isin(('read', 'write')))
+    return (timestamps[valid].to_numpy(np.float64),
+            offsets[valid].to_numpy(np.int64),
+            (operations[valid] == 'write').to_numpy().astype(np.int8))
+
+
+def _parse_trace_pandas(file_path):
+    """
+    Parses a trace CSV with pandas' single-threaded C engine.
+
+    :param file_path: Path to the CSV file.
+    :return: Tuple of arrays (timestamps, offsets, op codes).
+    """
+    data_frame = pd.read_csv(file_path, header=None, usecols=[0, 2, 4],
+                             engine='c', on_bad_lines='skip')
+    return _filter_columns(pd.to_numeric(data_frame[0], errors='coerce'),
+                           pd.to_numeric(data_frame[2], errors='coerce'),
+                           data_frame[4])
+
+
+def _parse_trace_mmap(file_path):
+    """
+    Parses a trace CSV by scanning a memory-mapped buffer directly.
+
+    Row and field boundaries are located with numpy byte scans over the
+    mapped file and only columns 0, 2 and 4 are ever materialized, so no
+    strings are allocated for unused fields. Kept as an explicit engine
+    choice: pyarrow's parallel reader is faster in practice, but this path
+    needs nothing beyond numpy.
+
+    :param file_path: Path to the CSV file.
+    :return: Tuple of arrays (timestamps, offsets, op codes).
+    """
+    with open(file_path, 'rb') as trace_file:
+        mapped = mmap.mmap(trace_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            buf = np.frombuffer(mapped, dtype=np.uint8)
+            size = buf.size
+            newlines = np.flatnonzero(buf == 0x0A)
+            commas = np.flatnonzero(buf == 0x2C)
+            # frombuffer exports a pointer into the map, which would make
+            # mapped.close() raise BufferError; drop the view as soon as the
+            # byte scans (which allocate fresh arrays) are done.
+            del buf
+            if size and (newlines.size == 0 or newlines[-1] != size - 1):
+                newlines = np.append(newlines, size)
+
+            raw_timestamps = []
+            raw_offsets = []
+            raw_operations = []
+            row_start = 0
+            for r in range(newlines.size):
+                row_end = int(newlines[r])
+                lo = np.searchsorted(commas, row_start)
+                hi = np.searchsorted(commas, row_end)
+                cols = commas[lo:hi]
+                if cols.size >= 4:
+                    # A 5-column row has four commas and the operation field
+                    # runs to the row end; wider rows end it at the fifth
+                    # comma. Any trailing '\r' is removed by the strip in
+                    # _filter_columns.
+                    op_end = int(cols[4]) if cols.size >= 5 else row_end
+                    raw_timestamps.append(mapped[row_start:cols[0]].decode('ascii', 'replace'))
+                    raw_offsets.append(mapped[cols[1] + 1:cols[2]].decode('ascii', 'replace'))
+                    raw_operations.append(mapped[cols[3] + 1:op_end].decode('ascii', 'replace'))
+                row_start = row_end + 1
+        finally:
+            mapped.close()
+
+    return _filter_columns(pd.to_numeric(pd.Series(raw_timestamps), errors='coerce'),
+                           pd.to_numeric(pd.Series(raw_offsets), errors='coerce'),
+                           pd.Series(raw_operations))
+
+
+def _parse_trace(file_path, engine='auto'):
+    """
+    Parses a trace CSV with the selected engine.
+
+    'auto' prefers pyarrow's multithreaded SIMD reader when installed and
+    otherwise uses pandas; 'mmap' selects the dependency-light scanner.
+
+    :param file_path: Path to the CSV file.
+    :param engine: One of 'auto', 'pyarrow', 'pandas' or 'mmap'.
+    :return: Tuple of arrays (timestamps, offsets, op codes).
+    """
+    if engine not in ('auto', 'pyarrow', 'pandas', 'mmap'):
+        raise ValueError(f"Unknown trace engine: {engine!r}")
+    if engine == 'mmap':
+        return _parse_trace_mmap(file_path)
+    if engine == 'pandas' or (engine == 'auto' and not PYARROW_AVAILABLE):
+        return _parse_trace_pandas(file_path)
+    if not PYARROW_AVAILABLE:
+        raise ImportError("engine='pyarrow' requires pyarrow to be installed")
+    try:
+        table = pacsv.read_csv(
+            str(file_path),
+            read_options=pacsv.ReadOptions(autogenerate_column_names=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=['f0', 'f2', 'f4'],
+                column_types={'f0': pa.float64(), 'f2': pa.float64(),
+                              'f4': pa.string()}))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return _parse_trace_pandas(file_path)
+    return _filter_columns(table['f0'].to_pandas(),
+                           table['f2'].to_pandas(),
+                           table['f4'].to_pandas())
+
+
+_CHUNK_END = object()
+
+
+def iter_chunks(file_path, start_time=0, end_time=float('inf'), chunksize=1_000_000):
+    """
+    Streams a trace as (offsets, op_codes) array pairs with bounded memory.
+
+    A background thread parses the CSV in chunksize-row pieces and feeds a
+    bounded queue, so disk and parse time overlap with the consumer's
+    simulation work. Unlike load(), nothing is read whole or cached to disk;
+    peak memory stays O(chunksize), making this the entry point for traces
+    too large for the in-memory loader.
+
+    :param file_path: Path to the CSV file.
+    :param start_time: Start time for filtering requests.
+    :param end_time: End time for filtering requests.
+    :param chunksize: Number of CSV rows parsed per chunk.
+    :return: Iterator of (offsets, int8 op codes) array pairs.
+    """
+    chunk_queue = queue.Queue(maxsize=4)
+    error = []
+
+    def _producer():
+        try:
+            for chunk in pd.read_csv(file_path, header=None, usecols=[0, 2, 4],
+                                     engine='c', on_bad_lines='skip',
+                                     chunksize=chunksize):
+                timestamps, offsets, op_codes = _filter_columns(
+                    pd.to_numeric(chunk[0], errors='coerce'),
+                    pd.to_numeric(chunk[2], errors='coerce'),
+                    chunk[4])
+                mask = (timestamps >= start_time) & (timestamps <= end_time)
+                if not mask.all():
+                    offsets = offsets[mask]
+                    op_codes = op_codes[mask]
+                if offsets.size:
+                    chunk_queue.put((offsets, op_codes))
+        except BaseException as exc:
+            error.append(exc)
+        finally:
+            chunk_queue.put(_CHUNK_END)
+
+    worker = threading.Thread(target=_producer, daemon=True)
+    worker.start()
+    while True:
+        item = chunk_queue.get()
+        if item is _CHUNK_END:
+            break
+        yield item
+    worker.join()
+    if error:
+        raise error[0]
+
+
+def load(file_path, start_time=0, end_time=float('inf'), engine='auto'):
+    """
+    Loads a trace's offset and operation columns, caching the parsed columns
+    to an .npz sidecar next to the CSV.
+
+    Every policy script replays the same four traces, so the CSV is parsed
+    once and later runs (under any policy) load the binary sidecar instead.
+    The time-range filter is applied after loading, which keeps the sidecar
+    valid for any start/end choice.
+
+    :param file_path: Path to the CSV file.
+    :param start_time: Start time for filtering requests.
+    :param end_time: End time for filtering requests.
+    :param engine: Parse engine for cold loads ('auto', 'pyarrow', 'pandas' or 'mmap').
+    :return: Tuple of parallel arrays (offsets, int8 op codes: 0=read, 1=write).
+    """
+    cache_path = file_path.with_suffix('.npz')
+    if cache_path.exists():
+        cached = np.load(cache_path)
+        timestamps = cached['timestamps']
+        offsets = cached['offsets']
+        op_codes = cached['op_codes']
+    else:
+        timestamps, offsets, op_codes = _parse_trace(file_path, engine)
+        np.savez(cache_path, timestamps=timestamps, offsets=offsets,
+                 op_codes=op_codes)
+
+    mask = (timestamps >= start_time) & (timestamps <= end_time)
+    if mask.all():
+        return offsets, op_codes
+    return offsets[mask], op_codes[mask]